@@ -0,0 +1,50 @@
+import pygame as pg
+
+class AssetRegistry:
+    def __init__(self):
+        self.assets = {}
+        self.ref_counts = {}
+
+    def acquire(self, key, loader):
+        # Assets are loaded on first use and shared by everyone asking for the same key
+        if key not in self.assets:
+            self.assets[key] = loader(key)
+            self.ref_counts[key] = 0
+        self.ref_counts[key] += 1
+        return self.assets[key]
+
+    def release(self, key):
+        if key in self.ref_counts:
+            self.ref_counts[key] = max(0, self.ref_counts[key] - 1)
+
+    def register(self, key, asset):
+        # Lets callers provide assets that don't come from disk, e.g. synthetic benchmark art
+        self.assets[key] = asset
+        self.ref_counts.setdefault(key, 0)
+
+    def purge(self):
+        # Drops every asset nobody holds a reference to any more
+        for key in [key for (key, count) in self.ref_counts.items() if count == 0]:
+            del self.assets[key]
+            del self.ref_counts[key]
+
+    def image(self, path):
+        return self.acquire(path, lambda key: pg.image.load(key).convert_alpha())
+
+    def images(self, paths):
+        return [self.image(path) for path in paths]
+
+    def sound(self, path, volume=1.0):
+        # Volume is set on the Sound itself, so each volume of a file gets its own copy
+        def load_sound(key):
+            sound = pg.mixer.Sound(key[0])
+            sound.set_volume(key[1])
+            return sound
+        return self.acquire((path, volume), load_sound)
+
+    def register_sound(self, path, volume, sound):
+        # Registered under the same key sound() looks up
+        sound.set_volume(volume)
+        self.register((path, volume), sound)
+
+registry = AssetRegistry()
\ No newline at end of file
@@ -0,0 +1,65 @@
+# Times the Player collision path against collision groups of growing size.
+# Run from the project root with: python -m benchmarks.collision
+import time
+from types import SimpleNamespace
+import pygame as pg
+import settings as st
+from spatial import CollisionGroup
+from tiles import TileForCollision
+from player import Player
+
+def build_group(tile_count):
+    group = CollisionGroup()
+    surf = pg.Surface((st.TILE_SIZE, st.TILE_SIZE))
+    columns = int(tile_count ** 0.5)
+    for i in range(tile_count):
+        # Tiles fill every other row of a square block, like stacked ledges
+        x, y = i % columns, (i // columns) * 2
+        TileForCollision((x * st.TILE_SIZE, y * st.TILE_SIZE), surf, group)
+    group.refresh()
+    return group
+
+def make_probe(group):
+    rect = pg.Rect(st.TILE_SIZE * 3 + 10, st.TILE_SIZE - 90, 60, 100)
+    return SimpleNamespace(
+        coll_obj=group,
+        rect=rect,
+        prev_rect=rect.move(0, -8),
+        pos=pg.math.Vector2(rect.topleft),
+        direction=pg.math.Vector2(1, 200),
+        on_ground=False,
+        moving_floor=None
+    )
+
+def full_scan(probe):
+    # The pre-broadphase behaviour: every collision sprite is tested
+    hits = 0
+    for _ in range(3):
+        for sprite in probe.coll_obj.sprites():
+            if sprite.rect.colliderect(probe.rect):
+                hits += 1
+    return hits
+
+def broadphase(probe):
+    start = probe.rect.copy()
+    Player.collision(probe, "horizontal")
+    Player.collision(probe, "vertical")
+    Player.check_on_ground(probe)
+    probe.rect = start
+
+def time_call(func, probe, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func(probe)
+    return (time.perf_counter() - start) / frames * 1e6
+
+def run(tile_counts=(1000, 4000, 16000, 64000), frames=2000):
+    print(f"{'tiles':>8} {'broadphase us':>15} {'full scan us':>14}")
+    for tile_count in tile_counts:
+        probe = make_probe(build_group(tile_count))
+        broad = time_call(broadphase, probe, frames)
+        scan = time_call(full_scan, probe, max(1, frames // 50))
+        print(f"{tile_count:>8} {broad:>15.2f} {scan:>14.2f}")
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
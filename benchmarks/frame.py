@@ -0,0 +1,95 @@
+# Times each phase of the frame pipeline on synthetic stress levels and writes percentiles as JSON.
+# Run from the project root with: python -m benchmarks.frame --out bench_results.json
+import json
+import time
+import random
+import argparse
+import numpy as np
+import pygame as pg
+import settings as st
+from game_clock import clock
+from inputs import ScriptedInput
+from benchmarks.world import build_world
+
+STRESS_LEVELS = {
+    'small': {'tiles': 1000, 'enemies': 10, 'bullets': 50, 'platforms': 2},
+    'medium': {'tiles': 4000, 'enemies': 50, 'bullets': 250, 'platforms': 8},
+    'large': {'tiles': 10000, 'enemies': 200, 'bullets': 1000, 'platforms': 20},
+    'bullet_storm': {'tiles': 4000, 'enemies': 50, 'bullets': 5000, 'platforms': 8}
+}
+PHASES = ['platform_restriction', 'sprite_update', 'bullet_collisions', 'custom_draw', 'frame']
+PLAYER_SCRIPT = [(240, ['RIGHT', 'SPACE']), (30, ['UP', 'RIGHT']), (240, ['LEFT', 'SPACE'])]
+
+def top_up_bullets(window, count, rng):
+    # Keeps roughly `count` bullets alive, spread over the air above the ground
+    level = window.level
+    for _ in range(count - window.bullets.count):
+        position = (rng.uniform(0, level.width * level.tilewidth), rng.uniform(level.tileheight, 6 * level.tileheight))
+        direction = pg.math.Vector2(rng.choice((-1, 1)), 0)
+        window.bullets.spawn(position, direction, clock.get_ticks())
+
+def percentiles(samples):
+    values = np.array(samples) * 1000
+    return {
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+        'p99': float(np.percentile(values, 99)),
+        'mean': float(values.mean())
+    }
+
+def run_level(config, frames, seed=0):
+    rng = random.Random(seed)
+    window = build_world(config['tiles'], config['enemies'], config['platforms'], ScriptedInput(PLAYER_SCRIPT))
+    timings = {phase: [] for phase in PHASES}
+    dt = 1 / st.TICK_RATE
+    timer = time.perf_counter
+
+    for _ in range(frames):
+        top_up_bullets(window, config['bullets'], rng)
+
+        # Mirrors GameWindow.update_world, split up so each phase can be timed
+        frame_start = timer()
+        clock.advance(dt)
+        window.platform_restriction()
+        window.coll_grp.refresh()
+        t1 = timer()
+        window.bullets.update(dt, clock.get_ticks())
+        window.all_sprites.update(dt)
+        window.enemy_squad.think(window.my_player)
+        t2 = timer()
+        window.bullet_collisions()
+        t3 = timer()
+        window.all_sprites.custom_draw(window.my_player)
+        t4 = timer()
+
+        timings['platform_restriction'].append(t1 - frame_start)
+        timings['sprite_update'].append(t2 - t1)
+        timings['bullet_collisions'].append(t3 - t2)
+        timings['custom_draw'].append(t4 - t3)
+        timings['frame'].append(t4 - frame_start)
+
+        window.check_game_over_conditions()
+        if window.game_over:
+            window.reset_game()
+
+    return {'config': config, 'frames': frames, 'phases_ms': {phase: percentiles(timings[phase]) for phase in PHASES}}
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame pipeline benchmark")
+    parser.add_argument('--levels', nargs='+', default=list(STRESS_LEVELS), choices=list(STRESS_LEVELS))
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--out', default='bench_results.json')
+    args = parser.parse_args()
+
+    results = {'tick_rate': st.TICK_RATE, 'levels': {}}
+    for name in args.levels:
+        results['levels'][name] = run_level(STRESS_LEVELS[name], args.frames)
+        frame = results['levels'][name]['phases_ms']['frame']
+        print(f"{name:>8}: frame p50 {frame['p50']:.2f}ms  p95 {frame['p95']:.2f}ms  p99 {frame['p99']:.2f}ms")
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Synthetic in-memory worlds for the benchmarks, built without any files on disk.
+import os
+import math
+from array import array
+import pygame as pg
+import settings as st
+from assets import registry
+from entity import build_animation_set
+from level import Level, LevelObject
+from main import GameWindow
+
+PLAYER_ANIMATIONS = ['right', 'left', 'right_idle', 'left_idle', 'right_jump', 'left_jump', 'right_duck', 'left_duck']
+ENEMY_ANIMATIONS = ['right', 'left']
+GROUND, BACKGROUND, PLATFORM = 1, 2, 3
+LAYER_NAMES = ["BG", "BG Detail", "Level", "FG Detail Bottom", "FG Detail Top"]
+
+def solid_surface(size, color):
+    surf = pg.Surface(size, pg.SRCALPHA)
+    surf.fill(color)
+    return surf
+
+def animation_set(names, color, frames=4):
+    return build_animation_set({name: [solid_surface((60, 100), color) for _ in range(frames)] for name in names})
+
+def init_headless():
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    pg.init()
+    pg.display.set_mode((st.WINDOW_WIDTH, st.WINDOW_HEIGHT))
+
+def register_synthetic_assets():
+    # Same registry keys the game loads from disk, so GameWindow picks these up unchanged
+    registry.register('./graphics/sky/bg_sky.png', solid_surface((2000, 400), (100, 100, 200, 255)))
+    registry.register('./graphics/sky/fg_sky.png', solid_surface((2000, 400), (120, 120, 220, 255)))
+    registry.register('./graphics/bullet.png', solid_surface((20, 8), (255, 255, 0, 255)))
+    registry.register('./graphics/fire/0.png', solid_surface((30, 20), (255, 120, 0, 255)))
+    registry.register('./graphics/fire/1.png', solid_surface((30, 20), (255, 80, 0, 255)))
+    registry.register('./graphics/health.png', solid_surface((30, 30), (255, 0, 0, 255)))
+    registry.register('./graphics/player', animation_set(PLAYER_ANIMATIONS, (0, 200, 0, 255)))
+    registry.register('./graphics/enemy', animation_set(ENEMY_ANIMATIONS, (200, 0, 0, 255)))
+
+    # Sounds are keyed by volume too, so these match the volumes GameWindow registers them with
+    for (name, volume) in (('music', 1.0), ('bullet', 0.2), ('hit', 0.2)):
+        registry.register_sound(f'./audio/{name}.wav', volume, pg.mixer.Sound(buffer=bytes(4410)))
+
+def build_level(tile_count, enemy_count, platform_count):
+    size = st.TILE_SIZE
+    width = max(80, enemy_count * 4 + 20, platform_count * 6 + 20)
+    ground_rows = max(1, math.ceil(tile_count / width))
+    height = ground_rows + 10
+
+    layers = {name: array('I', bytes(4 * width * height)) for name in LAYER_NAMES}
+    # Ground fills the bottom rows, the top one possibly only partly
+    for i in range(tile_count):
+        x, y = i % width, height - 1 - i // width
+        layers["Level"][y * width + x] = GROUND
+    for i in range(width * height):
+        if (i // width) % 2 == 0 and i % 3 == 0:
+            layers["BG Detail"][i] = BACKGROUND
+
+    def ground_top(x):
+        full_rows = tile_count // width
+        return (height - full_rows - (1 if x < tile_count % width else 0)) * size
+
+    entities = [LevelObject("Player", 3 * size, ground_top(3) - 150, 10, 10)]
+    for i in range(enemy_count):
+        x = 12 + i * 4
+        entities.append(LevelObject("Enemy", x * size, ground_top(x) - 95, 10, 10))
+
+    tile_images = {
+        GROUND: solid_surface((size, size), (90, 60, 30, 255)),
+        BACKGROUND: solid_surface((size, size), (30, 90, 30, 128)),
+        PLATFORM: solid_surface((size, size), (50, 50, 50, 255))
+    }
+    platforms = []
+    for i in range(platform_count):
+        x = (8 + i * 6) * size + size // 2
+        bottom = ground_top(x // size) - 3 * size
+        platforms.append(LevelObject("Platform", x, bottom - size, size, size, tile_images[PLATFORM]))
+        platforms.append(LevelObject("Border", x, size, size, 20))
+        platforms.append(LevelObject("Border", x, bottom + 20, size, 20))
+
+    objects = {"Entities": entities, "Platforms": platforms}
+    return Level(width, height, size, size, layers, objects, tile_images)
+
+def build_world(tile_count, enemy_count, platform_count, input_source=None):
+    init_headless()
+    register_synthetic_assets()
+    level = build_level(tile_count, enemy_count, platform_count)
+    return GameWindow(headless=True, input_source=input_source, level=level)
\ No newline at end of file
@@ -1,41 +1,141 @@
+import numpy as np
 import pygame as pg
 import settings as st
 
-class Bullet(pg.sprite.Sprite):
-    def __init__(self, position, surface, dir, groups, is_player_shot=False):
-        super().__init__(groups)
+class BulletSystem:
+    def __init__(self, surface, capacity=st.BULLET_CAPACITY):
+        # Both facings and their masks are prepared once instead of per shot
+        flipped = pg.transform.flip(surface, True, False)
+        self.images = {1: surface, -1: flipped}
+        self.masks = {1: pg.mask.from_surface(surface), -1: pg.mask.from_surface(flipped)}
+        self.width, self.height = surface.get_size()
         self.z = st.LAYERS['Level']
-        self.is_player_shot = is_player_shot
+        self.lifetime = 1500
 
-        self.image = surface
-        if dir.x < 0:
-            self.image = pg.transform.flip(self.image, True, False)
-        
-        self.rect = self.image.get_rect(center=position)
-        self.mask = pg.mask.from_surface(self.image)
+        # Structure of arrays, the first `count` rows are live bullets
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.spawn_time = np.zeros(capacity, dtype=np.int64)
+        self.is_player_shot = np.zeros(capacity, dtype=bool)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        self.facing = np.zeros(capacity, dtype=np.int8)
 
-        self.direction = dir
-        self.speed = 500
-        self.pos = pg.math.Vector2(self.rect.center)
-        self.start_time = pg.time.get_ticks()
+    def arrays(self):
+        return ('pos', 'prev_pos', 'vel', 'spawn_time', 'is_player_shot', 'damage', 'facing')
 
-    def update(self, deltaTime):
-        self.pos += self.direction * self.speed * deltaTime
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
+    def grow(self):
+        for name in self.arrays():
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
 
-        if pg.time.get_ticks() - self.start_time > 1500:
-            self.kill()
+    def spawn(self, position, dir, now, is_player_shot=False, speed=500, damage=1):
+        if self.count == len(self.pos):
+            self.grow()
+        i = self.count
+        self.pos[i] = self.prev_pos[i] = (position[0], position[1])
+        self.vel[i] = (dir.x * speed, dir.y * speed)
+        self.spawn_time[i] = now
+        self.is_player_shot[i] = is_player_shot
+        self.damage[i] = damage
+        self.facing[i] = 1 if dir.x >= 0 else -1
+        self.count += 1
+
+    def keep(self, alive):
+        # Compacts the live rows to the front, dropping the others
+        index = np.flatnonzero(alive)
+        for name in self.arrays():
+            array = getattr(self, name)
+            array[:len(index)] = array[index]
+        self.count = len(index)
+
+    def clear(self):
+        self.count = 0
+
+    def update(self, deltaTime, now):
+        n = self.count
+        self.prev_pos[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n] * deltaTime
+        expired = now - self.spawn_time[:n] > self.lifetime
+        if expired.any():
+            self.keep(~expired)
+
+    def rects(self):
+        # Same placement as Rect(center=(round(x), round(y))) for every bullet
+        centers = np.rint(self.pos[:self.count]).astype(np.int64)
+        left = centers[:, 0] - self.width // 2
+        top = centers[:, 1] - self.height // 2
+        return left, top, left + self.width, top + self.height
+
+    def any_player_shots(self):
+        return bool(self.is_player_shot[:self.count].any())
+
+    def collide_terrain(self, terrain, platforms):
+        if not self.count:
+            return
+        left, top, right, bottom = self.rects()
+        hit = terrain.hits_many(left, top, right, bottom)
+        for plt in platforms:
+            rect = plt.rect
+            hit |= (left < rect.right) & (right > rect.left) & (top < rect.bottom) & (bottom > rect.top)
+        if hit.any():
+            self.keep(~hit)
+
+    def collide_sprites(self, sprites):
+        # Returns (sprite, damage) for every sprite hit; a bullet is spent on the first sprite it touches
+        if not self.count or not sprites:
+            return []
+        left, top, right, bottom = self.rects()
+        boxes = np.array([tuple(sprite.rect) for sprite in sprites])
+        box_left, box_top = boxes[:, 0:1], boxes[:, 1:2]
+        box_right, box_bottom = box_left + boxes[:, 2:3], box_top + boxes[:, 3:4]
+        overlap = (left < box_right) & (right > box_left) & (top < box_bottom) & (bottom > box_top)
+
+        alive = np.ones(self.count, dtype=bool)
+        hit_sprites = []
+        for s in np.flatnonzero(overlap.any(axis=1)):
+            sprite = sprites[s]
+            damage = None
+            for b in np.flatnonzero(overlap[s] & alive):
+                offset = (int(left[b]) - sprite.rect.left, int(top[b]) - sprite.rect.top)
+                if sprite.mask.overlap(self.masks[int(self.facing[b])], offset):
+                    alive[b] = False
+                    if damage is None:
+                        damage = int(self.damage[b])
+            if damage is not None:
+                hit_sprites.append((sprite, damage))
+
+        if not alive.all():
+            self.keep(alive)
+        return hit_sprites
+
+    def blit_list(self, offset, view_rect, alpha=1.0):
+        n = self.count
+        if not n:
+            return []
+        centers = np.rint(self.prev_pos[:n] + (self.pos[:n] - self.prev_pos[:n]) * alpha)
+        visible = ((centers[:, 0] > view_rect.left) & (centers[:, 0] < view_rect.right) &
+                   (centers[:, 1] > view_rect.top) & (centers[:, 1] < view_rect.bottom))
+        xs = (centers[visible, 0] - self.width // 2 - offset.x).tolist()
+        ys = (centers[visible, 1] - self.height // 2 - offset.y).tolist()
+        facings = self.facing[:n][visible].tolist()
+        return [(self.images[facing], (x, y)) for (facing, x, y) in zip(facings, xs, ys)]
 
 class BulletAnimation(pg.sprite.Sprite):
-    def __init__(self, entity, surface_list, dir, groups):
-        super().__init__(groups)
+    def __init__(self, entity, surface_list, dir, groups, pool=None):
+        super().__init__()
         self.z = st.LAYERS['Level']
+        self.pool = pool
+        self.reset(entity, surface_list, dir, groups)
+
+    def reset(self, entity, surface_list, dir, groups):
         self.entity = entity
 
+        # Frames come pre-flipped for the shot direction
         self.frames = surface_list
-        if dir.x < 0:
-            self.frames = [pg.transform.flip(i, True, False) for i in self.frames]
-
         self.frame_index = 0
         self.image = self.frames[self.frame_index]
 
@@ -50,6 +150,13 @@ class BulletAnimation(pg.sprite.Sprite):
         self.offset = pg.math.Vector2(x_offset, y_offset)
 
         self.rect = self.image.get_rect(center=self.entity.rect.center + self.offset)
+        self.add(groups)
+
+    def kill(self):
+        if self.alive():
+            super().kill()
+            if self.pool:
+                self.pool.release_flash(self)
 
     def animate(self, deltaTime):
         self.frame_index += 15 * deltaTime
@@ -63,4 +170,31 @@ class BulletAnimation(pg.sprite.Sprite):
 
     def update(self, deltaTime):
         self.animate(deltaTime)
-        self.move_with_entity()
\ No newline at end of file
+        self.move_with_entity()
+
+class FlashPool:
+    def __init__(self, fire_surfs):
+        self.fire_frames = {
+            "right": fire_surfs,
+            "left": [pg.transform.flip(surf, True, False) for surf in fire_surfs]
+        }
+        self.free_flashes = []
+        self.hits = 0
+        self.misses = 0
+
+    def get_flash(self, entity, dir, groups):
+        frames = self.fire_frames["right" if dir.x >= 0 else "left"]
+        if self.free_flashes:
+            self.hits += 1
+            flash = self.free_flashes.pop()
+            flash.reset(entity, frames, dir, groups)
+        else:
+            self.misses += 1
+            flash = BulletAnimation(entity, frames, dir, groups, pool=self)
+        return flash
+
+    def release_flash(self, flash):
+        self.free_flashes.append(flash)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'free': len(self.free_flashes)}
\ No newline at end of file
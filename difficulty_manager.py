@@ -1,28 +1,150 @@
 import pygame as pg
 import numpy as np
-import pickle
+import settings as st
 import os
 from collections import deque
 import random
+from text_cache import text_cache
+from q_table import QTable, STATE_SHAPE, ACTION_COUNT
+from model_store import ModelWriter, read_model
+from telemetry import Telemetry
+
+# Pure scoring and rule helpers, shared by the live DifficultyManager and the offline trainer (train_difficulty.py)
+def difficulty_factors(difficulty_level):
+    # Scale parameters based on difficulty level
+    if difficulty_level == 1:
+        # Very easy at level 1
+        return (0.7, 1.5, 0.8)
+    # Progressive scaling after level 1: 30% more health, 15% faster firing, 20% faster bullets per level
+    return (0.7 + (difficulty_level - 1) * 0.3, 1.5 - (difficulty_level - 1) * 0.15, 0.8 + (difficulty_level - 1) * 0.2)
+
+def discretize_state(difficulty_level, metrics, health_percentage):
+    # Discretize player metrics to create state
+    accuracy = metrics['shots_hit'] / max(1, metrics['shots_fired'])
+    accuracy_level = min(5, int(accuracy * 5))  # 0-5 accuracy levels
+    health_level = min(5, int(health_percentage * 5))  # 0-5 health levels
+    
+    # Calculate kills per minute
+    time_in_minutes = max(0.1, metrics['time_alive'] / 60)
+    kills_per_minute = metrics['enemies_killed'] / time_in_minutes
+    kill_level = min(5, int(kills_per_minute * 2))  # 0-5 kill levels
+    
+    return (difficulty_level, accuracy_level, health_level, kill_level)
+
+def performance_score(metrics, health_percentage):
+    # Calculate a comprehensive performance score based on player metrics
+    
+    # Calculate accuracy (capped at 100%)
+    accuracy = min(1.0, metrics['shots_hit'] / max(1, metrics['shots_fired']))
+    
+    # Kills per minute
+    time_in_minutes = max(0.1, metrics['time_alive'] / 60)
+    kills_per_minute = metrics['enemies_killed'] / time_in_minutes
+    
+    # Damage efficiency (how much damage taken per enemy killed)
+    damage_efficiency = max(0, 1 - (metrics['damage_taken'] / max(1, metrics['enemies_killed'])))
+    
+    # Weight the components based on their importance
+    weights = {
+        'accuracy': 0.25,
+        'health': 0.25,
+        'kills': 0.3,
+        'damage_efficiency': 0.2
+    }
+    
+    # Calculate normalized scores (0-1 range)
+    scores = {
+        'accuracy': accuracy,
+        'health': health_percentage,
+        'kills': min(1.0, kills_per_minute / 5),  # 5 kills per minute is considered excellent
+        'damage_efficiency': damage_efficiency
+    }
+    
+    # Calculate weighted average score
+    return sum(scores[key] * weights[key] for key in weights)
+
+def reward_for(metrics, health_percentage):
+    # Base reward on performance, mapping 0-1 to -1 to 1
+    base_reward = performance_score(metrics, health_percentage) * 2 - 1
+    
+    # Additional reward for balanced challenge
+    optimal_health = 0.75
+    health_balance = 1 - abs(health_percentage - optimal_health)
+    
+    # Combine rewards
+    return base_reward * 0.7 + health_balance * 0.3
+
+def rule_override(action, difficulty_level, score, good_threshold=0.7, poor_threshold=0.3):
+    # Override with common sense rules for early game
+    if difficulty_level == 1 and score > good_threshold:
+        # If player is doing well at level 1, suggest increase
+        return 0  # Increase difficulty
+    if score < poor_threshold and difficulty_level > 1:
+        # If player is struggling and not at minimum difficulty, suggest decrease
+        return 1  # Decrease difficulty
+    return action
+
+# Actions are [increase, decrease, maintain]; a completed challenge's reward counts as an increase
+CHANGE_ACTIONS = {'increase': 0, 'challenge_success': 0, 'decrease': 1, 'maintain': 2}
+CHALLENGE_DURATION = 180  # 3 minutes in seconds
+CHALLENGE_ACCURACY = 0.85
+
+def changed_level(difficulty_level, change):
+    # The level after a change, and how much it adds to enemy bullet damage
+    if change == "increase":
+        return (min(10, difficulty_level + 1), 0)
+    if change == "decrease":
+        return (max(1, difficulty_level - 1), 0)
+    if change == "challenge_success":
+        # Significant increase, plus a permanent increase in enemy bullet damage
+        return (min(10, difficulty_level + 2), 1)
+    return (difficulty_level, 0)
+
+def enemy_parameters(difficulty_level):
+    # (health, ms between shots, bullet speed) of enemies at a difficulty level
+    health_factor, fire_rate_factor, bullet_speed_factor = difficulty_factors(difficulty_level)
+    return (max(1, int(st.ENEMY_BASE_HEALTH * health_factor)),
+            max(300, int(st.ENEMY_BASE_FIRE_RATE * fire_rate_factor)),
+            int(st.ENEMY_BASE_BULLET_SPEED * bullet_speed_factor))
+
+def challenge_ready(difficulty_level, metrics):
+    # Good accuracy but still at low difficulty
+    accuracy = metrics['shots_hit'] / max(1, metrics['shots_fired'])
+    return accuracy >= 0.75 and difficulty_level < 3
+
+def evaluation_due(metrics, evaluation_interval=60):
+    # More frequent evaluations in the first few minutes
+    threshold = 30 if metrics['time_alive'] < 180 else evaluation_interval
+    return metrics['time_alive'] - metrics['last_evaluation_time'] >= threshold
+
+def load_q_table(path):
+    model = read_model(path)
+    # Older models were a pickled dict of {state: [q, q, q]}
+    if isinstance(model, dict):
+        return QTable.from_dict(model)
+    values = np.asarray(model, dtype=float)
+    if values.shape != STATE_SHAPE + (ACTION_COUNT,):
+        raise ValueError(f"Model has shape {values.shape}, expected {STATE_SHAPE + (ACTION_COUNT,)}")
+    return QTable(values)
 
 class DifficultyManager:
-    def __init__(self, game):
+    def __init__(self, game, seed=None):
         self.game = game
         
+        # All of the manager's randomness comes from here, so a recorded session replays the same decisions
+        self.rng = random.Random(seed if seed is not None else getattr(game, 'seed', None))
+        
         # Current difficulty level (start very easy)
         self.difficulty_level = 1
         
-        # Base difficulty parameters
-        self.base_enemy_health = 2  # Very low health for level 1
-        self.base_enemy_fire_rate = 1500  # Very slow fire rate at level 1
-        self.base_enemy_bullet_damage = 1
-        self.base_enemy_bullet_speed = 300  # Slow bullets at level 1
-        self.base_player_bullet_damage = 2  # Player starts stronger
+        # Base difficulty parameters; enemy health, fire rate and bullet speed scale from settings
+        self.base_enemy_bullet_damage = st.ENEMY_BASE_BULLET_DAMAGE
+        self.base_player_bullet_damage = st.PLAYER_BASE_BULLET_DAMAGE  # Player starts stronger
         
         # Challenge tracking
         self.challenge_start_time = 0
         self.challenge_active = False
-        self.challenge_duration = 180  # 3 minutes in seconds
+        self.challenge_duration = CHALLENGE_DURATION
         self.challenge_completed = False
         self.challenge_failed = False
         
@@ -41,14 +163,18 @@ class DifficultyManager:
         # Player position tracking
         self.last_position = None
         
+        # Every registered event is also logged with its time for later analysis
+        self.telemetry = Telemetry()
+        
         # State-action value function (Q-table)
-        self.q_table = {}
+        self.q_table = QTable()
         
         # Experience replay buffer
         self.replay_buffer = deque(maxlen=1000)
         
         # Load previous Q-table if exists
         self.load_model()
+        self.model_writer = ModelWriter(st.MODEL_PATH, st.MODEL_SAVE_DELAY)
         
         # Warning signs
         self.show_warning = False
@@ -89,7 +215,7 @@ class DifficultyManager:
         self.poor_performance_threshold = 0.3
         
         # Accuracy threshold for challenge
-        self.accuracy_threshold = 0.85  # 85% accuracy
+        self.accuracy_threshold = CHALLENGE_ACCURACY
         
         # Feedback messages
         self.feedback_message = ""
@@ -97,65 +223,40 @@ class DifficultyManager:
         self.feedback_duration = 5000  # 5 seconds
     
     def load_model(self):
-        if os.path.exists('difficulty_model.pkl'):
+        path = st.MODEL_PATH if os.path.exists(st.MODEL_PATH) else st.LEGACY_MODEL_PATH
+        if os.path.exists(path):
             try:
-                with open('difficulty_model.pkl', 'rb') as f:
-                    self.q_table = pickle.load(f)
+                self.q_table = load_q_table(path)
                 print("Difficulty model loaded successfully")
             except Exception as e:
+                # A model that can't be used is ignored and training starts from a fresh table
+                self.q_table = QTable()
                 print(f"Failed to load difficulty model: {e}")
     
     def save_model(self):
-        try:
-            with open('difficulty_model.pkl', 'wb') as f:
-                pickle.dump(self.q_table, f)
-            print("Difficulty model saved successfully")
-        except Exception as e:
-            print(f"Failed to save difficulty model: {e}")
+        # Written by the background writer, so the frame never waits on the disk
+        self.model_writer.request_save(self.q_table.values)
+    
+    def health_percentage(self):
+        return self.game.my_player.health / self.game.my_player.max_health
     
     def get_state(self):
-        # Discretize player metrics to create state
-        accuracy = self.player_metrics['shots_hit'] / max(1, self.player_metrics['shots_fired'])
-        accuracy_level = min(5, int(accuracy * 5))  # 0-5 accuracy levels
-        
-        health_percentage = self.game.my_player.health / self.game.my_player.max_health
-        health_level = min(5, int(health_percentage * 5))  # 0-5 health levels
-        
-        # Calculate kills per minute
-        time_in_minutes = max(0.1, self.player_metrics['time_alive'] / 60)
-        kills_per_minute = self.player_metrics['enemies_killed'] / time_in_minutes
-        kill_level = min(5, int(kills_per_minute * 2))  # 0-5 kill levels
-        
-        return (self.difficulty_level, accuracy_level, health_level, kill_level)
+        return discretize_state(self.difficulty_level, self.player_metrics, self.health_percentage())
     
     def get_q_value(self, state, action):
-        if state not in self.q_table:
-            self.q_table[state] = [0, 0, 0]  # [increase, decrease, maintain]
-        return self.q_table[state][action]
+        return self.q_table.get(state, action)
     
     def update_q_value(self, state, action, reward, next_state):
         # Q-learning update
-        current_q = self.get_q_value(state, action)
-        
-        # Get max Q-value for next state
-        next_max_q = max([self.get_q_value(next_state, a) for a in range(3)])
-        
-        # Q-learning formula
-        new_q = current_q + 0.1 * (reward + 0.9 * next_max_q - current_q)
-        
-        # Update Q-table
-        if state not in self.q_table:
-            self.q_table[state] = [0, 0, 0]
-        self.q_table[state][action] = new_q
+        self.q_table.update(state, action, reward, next_state)
     
     def choose_action(self, state):
         # Epsilon-greedy policy
-        if random.random() < 0.2:
-            return random.randint(0, 2)  # Random action
+        if self.rng.random() < 0.2:
+            return self.rng.randint(0, 2)  # Random action
         else:
             # Choose action with highest Q-value
-            q_values = [self.get_q_value(state, a) for a in range(3)]
-            return q_values.index(max(q_values))
+            return self.q_table.best_action(state)
     
     def update_metrics(self, deltaTime):
         # Update time alive
@@ -181,59 +282,11 @@ class DifficultyManager:
                 self.feedback_time = pg.time.get_ticks()
     
     def get_performance_score(self):
-        # Calculate a comprehensive performance score based on player metrics
-        
-        # Calculate accuracy (capped at 100%)
-        accuracy = min(1.0, self.player_metrics['shots_hit'] / max(1, self.player_metrics['shots_fired']))
-        
-        # Health percentage
-        health_percentage = self.game.my_player.health / self.game.my_player.max_health
-        
-        # Kills per minute
-        time_in_minutes = max(0.1, self.player_metrics['time_alive'] / 60)
-        kills_per_minute = self.player_metrics['enemies_killed'] / time_in_minutes
-        
-        # Damage efficiency (how much damage taken per enemy killed)
-        damage_efficiency = max(0, 1 - (self.player_metrics['damage_taken'] / 
-                                        max(1, self.player_metrics['enemies_killed'])))
-        
-        # Weight the components based on their importance
-        weights = {
-            'accuracy': 0.25,
-            'health': 0.25,
-            'kills': 0.3,
-            'damage_efficiency': 0.2
-        }
-        
-        # Calculate normalized scores (0-1 range)
-        scores = {
-            'accuracy': accuracy,
-            'health': health_percentage,
-            'kills': min(1.0, kills_per_minute / 5),  # 5 kills per minute is considered excellent
-            'damage_efficiency': damage_efficiency
-        }
-        
-        # Calculate weighted average score
-        total_score = sum(scores[key] * weights[key] for key in weights)
-        
-        return total_score
+        return performance_score(self.player_metrics, self.health_percentage())
     
     def get_reward(self):
         # Calculate reward based on player performance
-        performance_score = self.get_performance_score()
-        
-        # Base reward on performance
-        base_reward = performance_score * 2 - 1  # Maps 0-1 to -1 to 1
-        
-        # Additional reward for balanced challenge
-        optimal_health = 0.75
-        health_percentage = self.game.my_player.health / self.game.my_player.max_health
-        health_balance = 1 - abs(health_percentage - optimal_health)
-        
-        # Combine rewards
-        total_reward = base_reward * 0.7 + health_balance * 0.3
-        
-        return total_reward
+        return reward_for(self.player_metrics, self.health_percentage())
     
     def check_challenge_completion(self):
         # Check if player completed challenge within time limit
@@ -266,8 +319,7 @@ class DifficultyManager:
         
         # Check if we should start a challenge
         if not self.challenge_active and not self.challenge_completed and not self.challenge_failed:
-            accuracy = self.player_metrics['shots_hit'] / max(1, self.player_metrics['shots_fired'])
-            if accuracy >= 0.75 and self.difficulty_level < 3:  # Good accuracy but still at low difficulty
+            if challenge_ready(self.difficulty_level, self.player_metrics):
                 self.start_challenge()
                 return "challenge"
         
@@ -275,13 +327,8 @@ class DifficultyManager:
         state = self.get_state()
         action = self.choose_action(state)
         
-        # Override with common sense rules for early game
-        if self.difficulty_level == 1 and performance_score > self.good_performance_threshold:
-            # If player is doing well at level 1, suggest increase
-            action = 0  # Increase difficulty
-        elif performance_score < self.poor_performance_threshold and self.difficulty_level > 1:
-            # If player is struggling and not at minimum difficulty, suggest decrease
-            action = 1  # Decrease difficulty
+        action = rule_override(action, self.difficulty_level, performance_score,
+                               self.good_performance_threshold, self.poor_performance_threshold)
         
         if action == 0 and self.difficulty_level < 10:  # Increase difficulty
             self.show_warning = True
@@ -307,21 +354,19 @@ class DifficultyManager:
         old_state = self.get_state()
         old_difficulty = self.difficulty_level
         
+        self.difficulty_level, extra_damage = changed_level(self.difficulty_level, change)
+        self.base_enemy_bullet_damage += extra_damage
         if change == "increase":
-            self.difficulty_level = min(10, self.difficulty_level + 1)
             self.feedback_message = f"Difficulty increased to level {self.difficulty_level}. Enemies are stronger now!"
         elif change == "decrease":
-            self.difficulty_level = max(1, self.difficulty_level - 1)
             self.feedback_message = f"Difficulty decreased to level {self.difficulty_level}. You'll find the game a bit easier."
         elif change == "challenge_success":
-            # Significant increase for challenge success
-            self.difficulty_level = min(10, self.difficulty_level + 2)
-            self.base_enemy_bullet_damage += 1  # Permanent increase in enemy bullet damage
             self.feedback_message = f"Challenge completed! Difficulty jumped to level {self.difficulty_level}. Enemy bullets now deal more damage!"
         else:
             self.feedback_message = f"Difficulty maintained at level {self.difficulty_level}."
         
         self.feedback_time = pg.time.get_ticks()
+        self.telemetry.record('difficulty_change', value=self.difficulty_level - old_difficulty, level=self.difficulty_level)
         
         # Apply difficulty changes to game parameters
         self.apply_difficulty_parameters()
@@ -333,7 +378,7 @@ class DifficultyManager:
         new_state = self.get_state()
         
         # Update Q-table
-        action = 0 if change == "increase" or change == "challenge_success" else 1 if change == "decrease" else 2
+        action = CHANGE_ACTIONS[change]
         self.update_q_value(old_state, action, reward, new_state)
         
         # Store experience in replay buffer
@@ -352,9 +397,9 @@ class DifficultyManager:
     def experience_replay(self):
         # Perform batch learning from replay buffer
         if len(self.replay_buffer) > 32:
-            batch = random.sample(self.replay_buffer, 32)
-            for state, action, reward, next_state in batch:
-                self.update_q_value(state, action, reward, next_state)
+            batch = self.rng.sample(self.replay_buffer, 32)
+            states, actions, rewards, next_states = zip(*batch)
+            self.q_table.update_batch(states, actions, rewards, next_states)
     
     def reset_metrics(self):
         # Store the time of this evaluation
@@ -367,61 +412,48 @@ class DifficultyManager:
         self.player_metrics['shots_hit'] = 0
     
     def apply_difficulty_parameters(self):
-        # Scale parameters based on difficulty level
-        if self.difficulty_level == 1:
-            # Very easy at level 1
-            health_factor = 0.7
-            fire_rate_factor = 1.5
-            bullet_speed_factor = 0.8
-        else:
-            # Progressive scaling after level 1
-            health_factor = 0.7 + (self.difficulty_level - 1) * 0.3  # 30% increase per level after level 1
-            fire_rate_factor = 1.5 - (self.difficulty_level - 1) * 0.15  # 15% decrease per level (faster firing)
-            bullet_speed_factor = 0.8 + (self.difficulty_level - 1) * 0.2  # 20% increase per level
+        enemy_health, time_bw_shots, bullet_speed = enemy_parameters(self.difficulty_level)
         
         # Update enemy parameters for all existing enemies
         for enemy in [sprite for sprite in self.game.vulnerable_grp.sprites() 
                      if sprite != self.game.my_player]:
             if hasattr(enemy, 'health'):
                 # Scale enemy health based on difficulty
-                enemy.health = max(1, int(self.base_enemy_health * health_factor))
+                enemy.health = enemy_health
                 
                 # Scale enemy fire rate based on difficulty
                 if hasattr(enemy, 'time_bw_shots'):
-                    enemy.time_bw_shots = max(300, int(self.base_enemy_fire_rate * fire_rate_factor))
+                    enemy.time_bw_shots = time_bw_shots
         
         # Update bullet speed for future bullets
         # This is used when creating new bullets
-        self.current_bullet_speed = int(self.base_enemy_bullet_speed * bullet_speed_factor)
+        self.current_bullet_speed = bullet_speed
     
     def register_shot_fired(self):
         self.player_metrics['shots_fired'] += 1
+        self.telemetry.record('shot_fired', level=self.difficulty_level)
     
     def register_shot_hit(self):
         self.player_metrics['shots_hit'] += 1
+        self.telemetry.record('shot_hit', level=self.difficulty_level)
         
         # Check if challenge is completed after each successful hit
         self.check_challenge_completion()
     
     def register_enemy_killed(self):
         self.player_metrics['enemies_killed'] += 1
+        self.telemetry.record('enemy_killed', level=self.difficulty_level)
     
     def register_damage_taken(self):
         self.player_metrics['damage_taken'] += 1
+        self.telemetry.record('damage_taken', level=self.difficulty_level)
     
     def check_progress(self, deltaTime):
         # Update metrics
         self.update_metrics(deltaTime)
         
         # Check if it's time for an evaluation
-        time_since_last_eval = self.player_metrics['time_alive'] - self.player_metrics['last_evaluation_time']
-        
-        # More frequent evaluations in the first few minutes
-        evaluation_threshold = self.evaluation_interval
-        if self.player_metrics['time_alive'] < 180:  # First 3 minutes
-            evaluation_threshold = 30  # Check every 30 seconds initially
-        
-        if time_since_last_eval >= evaluation_threshold:
+        if evaluation_due(self.player_metrics, self.evaluation_interval):
             self.suggest_difficulty_change()
     
     def draw_warning(self):
@@ -433,7 +465,7 @@ class DifficultyManager:
                 
                 # Make it flash
                 if (current_time // 250) % 2 == 0:
-                    text = self.font.render("DIFFICULTY INCREASE SUGGESTED!", True, (255, 50, 50))
+                    text = text_cache.render(self.font, "DIFFICULTY INCREASE SUGGESTED!", (255, 50, 50))
                     text_rect = text.get_rect(center=(640, 150))
                     display_surface.blit(text, text_rect)
             else:
@@ -446,19 +478,17 @@ class DifficultyManager:
                 display_surface = pg.display.get_surface()
                 
                 # Draw background
-                prompt_bg = pg.Surface((600, 150))
-                prompt_bg.set_alpha(200)
-                prompt_bg.fill((0, 0, 0))
+                prompt_bg = text_cache.panel((600, 150), (0, 0, 0), 200)
                 bg_rect = prompt_bg.get_rect(center=(640, 360))
                 display_surface.blit(prompt_bg, bg_rect)
                 
                 # Draw text based on prompt type
                 if self.prompt_type == "difficulty":
-                    text1 = self.font.render("You're doing well! Increase difficulty?", True, (255, 255, 255))
-                    text2 = self.font.render("Press Y to increase, N to stay at current level", True, (255, 255, 255))
+                    text1 = text_cache.render(self.font, "You're doing well! Increase difficulty?", (255, 255, 255))
+                    text2 = text_cache.render(self.font, "Press Y to increase, N to stay at current level", (255, 255, 255))
                 elif self.prompt_type == "challenge":
-                    text1 = self.font.render("Challenge completed! Accept harder difficulty?", True, (255, 255, 0))
-                    text2 = self.font.render("Press Y to increase enemy damage, N to decline", True, (255, 255, 0))
+                    text1 = text_cache.render(self.font, "Challenge completed! Accept harder difficulty?", (255, 255, 0))
+                    text2 = text_cache.render(self.font, "Press Y to increase enemy damage, N to decline", (255, 255, 0))
                 
                 text1_rect = text1.get_rect(center=(640, 330))
                 text2_rect = text2.get_rect(center=(640, 370))
@@ -480,14 +510,12 @@ class DifficultyManager:
             display_surface = pg.display.get_surface()
             
             # Draw background
-            feedback_bg = pg.Surface((600, 40))
-            feedback_bg.set_alpha(150)
-            feedback_bg.fill((0, 0, 0))
+            feedback_bg = text_cache.panel((600, 40), (0, 0, 0), 150)
             bg_rect = feedback_bg.get_rect(center=(640, 50))
             display_surface.blit(feedback_bg, bg_rect)
             
             # Draw text
-            text = self.small_font.render(self.feedback_message, True, (255, 255, 255))
+            text = text_cache.render(self.small_font, self.feedback_message, (255, 255, 255))
             text_rect = text.get_rect(center=(640, 50))
             display_surface.blit(text, text_rect)
     
@@ -501,37 +529,37 @@ class DifficultyManager:
             seconds = int(remaining_time % 60)
             
             # Draw timer
-            timer_text = self.small_font.render(f"Challenge: {minutes}:{seconds:02d}", True, (255, 255, 0))
+            timer_text = text_cache.render(self.small_font, f"Challenge: {minutes}:{seconds:02d}", (255, 255, 0))
             display_surface.blit(timer_text, (10, 130))
             
             # Draw accuracy
             accuracy = self.player_metrics['shots_hit'] / max(1, self.player_metrics['shots_fired']) * 100
             acc_color = (0, 255, 0) if accuracy >= self.accuracy_threshold * 100 else (255, 100, 100)
-            acc_text = self.small_font.render(f"Accuracy: {accuracy:.1f}% (Target: {self.accuracy_threshold * 100}%)", True, acc_color)
+            acc_text = text_cache.render(self.small_font, f"Accuracy: {accuracy:.1f}% (Target: {self.accuracy_threshold * 100}%)", acc_color)
             display_surface.blit(acc_text, (10, 160))
     
     def draw_performance_indicators(self):
         display_surface = pg.display.get_surface()
         
         # Draw difficulty level
-        diff_text = self.small_font.render(f"Difficulty: {self.difficulty_level}/10", True, (255, 255, 255))
+        diff_text = text_cache.render(self.small_font, f"Difficulty: {self.difficulty_level}/10", (255, 255, 255))
         display_surface.blit(diff_text, (10, 40))
         
         # Draw accuracy
         accuracy = self.player_metrics['shots_hit'] / max(1, self.player_metrics['shots_fired']) * 100
-        acc_text = self.small_font.render(f"Accuracy: {accuracy:.1f}%", True, (255, 255, 255))
+        acc_text = text_cache.render(self.small_font, f"Accuracy: {accuracy:.1f}%", (255, 255, 255))
         display_surface.blit(acc_text, (10, 70))
         
         # Draw kills
-        kills_text = self.small_font.render(f"Kills: {self.player_metrics['enemies_killed']}", True, (255, 255, 255))
+        kills_text = text_cache.render(self.small_font, f"Kills: {self.player_metrics['enemies_killed']}", (255, 255, 255))
         display_surface.blit(kills_text, (10, 100))
         
         # Draw challenge status if not active
         if self.challenge_completed:
-            status_text = self.small_font.render("Challenge: Completed!", True, (0, 255, 0))
+            status_text = text_cache.render(self.small_font, "Challenge: Completed!", (0, 255, 0))
             display_surface.blit(status_text, (10, 130))
         elif self.challenge_failed:
-            status_text = self.small_font.render("Challenge: Failed", True, (255, 100, 100))
+            status_text = text_cache.render(self.small_font, "Challenge: Failed", (255, 100, 100))
             display_surface.blit(status_text, (10, 130))
     
     def handle_input(self, event):
@@ -0,0 +1,63 @@
+import pygame as pg
+
+def merge_rects(rects):
+    # Overlapping rects are folded together so each region is redrawn once
+    regions = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(regions)
+        while index != -1:
+            rect.union_ip(regions.pop(index))
+            index = rect.collidelist(regions)
+        regions.append(rect)
+    return regions
+
+class DirtyRects:
+    def __init__(self, surface, max_regions=16):
+        self.surface = surface
+        self.screen_rect = surface.get_rect()
+        self.max_regions = max_regions
+        self.camera = None
+        self.rects = []
+        self.previous = []
+        self.regions = []
+        self.full = True
+        self.force_full = True
+
+    def invalidate(self):
+        # The next frame is redrawn and pushed in full, e.g. after something drew outside the tracked rects
+        self.force_full = True
+
+    def on_screen(self, rects):
+        clipped = [rect.clip(self.screen_rect) for rect in rects]
+        return [rect for rect in clipped if rect.width and rect.height]
+
+    def begin_frame(self, camera, rects):
+        # Returns the clip rects the world has to be drawn in, [None] meaning the whole window.
+        # Any scroll moves everything on screen, so only a still camera gets partial updates
+        self.full = self.force_full or camera != self.camera
+        self.force_full = False
+        self.camera = camera
+        self.rects = self.on_screen(rects)
+        if self.full:
+            self.regions = []
+            return [None]
+
+        self.regions = merge_rects(self.rects + self.previous)
+        if len(self.regions) > self.max_regions:
+            self.regions = [self.regions[0].unionall(self.regions[1:])]
+        return self.regions
+
+    def add(self, rects):
+        # Overlays drawn over the finished world (the HUD); where they were last frame is redrawn by begin_frame
+        rects = self.on_screen(rects)
+        self.rects.extend(rects)
+        if not self.full:
+            self.regions.extend(rects)
+
+    def update_display(self):
+        if self.full:
+            pg.display.update()
+        else:
+            pg.display.update(self.regions)
+        self.previous = self.rects
\ No newline at end of file
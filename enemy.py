@@ -1,16 +1,23 @@
+import numpy as np
 import pygame as pg
 import settings as st
+from game_clock import clock
 from entity import Entity
+from sound_manager import sounds
 
 class Enemy(Entity):
+    moving = False
+    state_attrs = Entity.state_attrs + ('bullet_speed',)
+
     def __init__(self, position, asset_path, groups, create_bullet, player, coll_sprites):
         super().__init__(position=position, asset_path=asset_path, groups=groups, create_bullet=create_bullet)
         self.time_bw_shots = 700
         self.player = player
         self.bullet_damage = 1
         self.bullet_speed = 500
+        self.squad = None
 
-        for sprite in coll_sprites.sprites():
+        for sprite in coll_sprites.near(pg.Rect(self.rect.midbottom, (1, 1))):
             if sprite.rect.collidepoint(self.rect.midbottom):
                 self.rect.bottom = sprite.rect.top
 
@@ -31,24 +38,88 @@ class Enemy(Entity):
             same_y = False
 
         if dist < 600 and same_y and self.can_shoot:
-            if self.move_dir == "right":
-                blt_dir = pg.math.Vector2(1, 0)
-            else:
-                blt_dir = pg.math.Vector2(-1, 0)
-
-            y_offset = pg.math.Vector2(0, -15)
-            blt_pos = self.rect.center + blt_dir * 60
-
-            self.fire_bullet(blt_pos + y_offset, blt_dir, self)
-            self.can_shoot = False
-            self.blt_time = pg.time.get_ticks()
-            self.fire_sound.play()
+            self.fire()
+
+    def fire(self):
+        if self.move_dir == "right":
+            blt_dir = pg.math.Vector2(1, 0)
+        else:
+            blt_dir = pg.math.Vector2(-1, 0)
+
+        y_offset = pg.math.Vector2(0, -15)
+        blt_pos = self.rect.center + blt_dir * 60
+
+        self.fire_bullet(blt_pos + y_offset, blt_dir, self)
+        self.can_shoot = False
+        self.blt_time = clock.get_ticks()
+        sounds.play('fire', self.rect)
     
     def update(self, deltaTime):
-        self.get_face_dir()
+        # Facing and firing of enemies in a squad are decided by EnemySquad.think
+        if not self.squad:
+            self.get_face_dir()
         self.animate(deltaTime)
         self.blink()
         self.blt_timer()
         self.invulnerable_timer()
-        self.should_fire()
-        self.check_alive()
\ No newline at end of file
+        if not self.squad:
+            self.should_fire()
+        self.check_alive()
+
+class EnemySquad(pg.sprite.Group):
+    def __init__(self):
+        super().__init__()
+        self.enemies = []
+        self.dirty = True
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        sprite.squad = self
+        self.dirty = True
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        sprite.squad = None
+        self.dirty = True
+
+    def rebuild(self):
+        # Enemies never move, so their rects are gathered only when the squad changes
+        self.enemies = self.sprites()
+        rects = np.array([tuple(enemy.rect) for enemy in self.enemies], dtype=np.int64).reshape(-1, 4)
+        self.center_x = rects[:, 0] + rects[:, 2] // 2
+        self.center_y = rects[:, 1] + rects[:, 3] // 2
+        self.top = rects[:, 1]
+        self.bottom = rects[:, 1] + rects[:, 3]
+        self.facing_left = None
+        self.dirty = False
+
+    def refresh(self):
+        # Called after a snapshot restore, which can change facings behind the squad's back
+        self.dirty = True
+
+    def think(self, player):
+        if self.dirty:
+            self.rebuild()
+        if not self.enemies:
+            return
+
+        player_x, player_y = player.rect.center
+        facing_left = player_x < self.center_x
+        if self.facing_left is None:
+            turned = np.arange(len(self.enemies))
+        else:
+            turned = np.flatnonzero(facing_left != self.facing_left)
+        for i in turned:
+            enemy = self.enemies[i]
+            enemy.move_dir = "left" if facing_left[i] else "right"
+            # The frame was already picked this tick, so it is picked again for the new facing
+            enemy.animate(0)
+            enemy.blink()
+        self.facing_left = facing_left
+
+        dist_sq = (player_x - self.center_x) ** 2 + (player_y - self.center_y) ** 2
+        in_range = (dist_sq < 600 ** 2) & (self.top - 20 < player_y) & (self.bottom + 20 > player_y)
+        for i in np.flatnonzero(in_range):
+            enemy = self.enemies[i]
+            if enemy.can_shoot:
+                enemy.fire()
\ No newline at end of file
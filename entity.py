@@ -1,9 +1,44 @@
 import pygame as pg
 import settings as st
-from os import walk
+from game_clock import clock
+from os import walk, path
 from math import sin
+from assets import registry
+from sound_manager import sounds
+
+def make_flash_surf(mask):
+    white_surf = mask.to_surface()
+    white_surf.set_colorkey((0, 0, 0))
+    return white_surf
+
+def load_animation_set(asset_path):
+    animations = {}
+    for (index, folder) in enumerate(walk(asset_path)):
+        if index == 0:
+            for subfolder in folder[1]:
+                animations[subfolder] = []
+        else:
+            name = path.basename(folder[0])
+            for img in sorted(folder[2], key=lambda string: int(string.split(".")[0])):
+                surf = pg.image.load(path.join(folder[0], img)).convert_alpha()
+                animations[name].append(surf)
+    return build_animation_set(animations)
+
+def build_animation_set(animations):
+    # Masks and white hit-flash silhouettes are built once per frame here, not on every update
+    masks = {}
+    flash_surfs = {}
+    for (name, frames) in animations.items():
+        masks[name] = [pg.mask.from_surface(surf) for surf in frames]
+        flash_surfs[name] = [make_flash_surf(mask) for mask in masks[name]]
+    return (animations, masks, flash_surfs)
 
 class Entity(pg.sprite.Sprite):
+    state_attrs = (
+        'rect', 'prev_rect', 'pos', 'direction', 'image', 'mask', 'frame_index', 'move_dir', 'ducking',
+        'health', 'vulnerable', 'time_last_hit', 'can_shoot', 'blt_time', 'time_bw_shots', 'bullet_damage'
+    )
+
     def __init__(self, position, asset_path, groups, create_bullet):
         super().__init__(groups)
         self.import_assets(asset_path)
@@ -14,7 +49,7 @@ class Entity(pg.sprite.Sprite):
         self.rect = self.image.get_rect(topleft=position)
         self.prev_rect = self.rect.copy()
         self.z = st.LAYERS["Level"]
-        self.mask = pg.mask.from_surface(self.image)
+        self.mask = self.masks[self.move_dir][self.frame_index]
 
         self.pos = pg.math.Vector2(self.rect.topleft)
         self.direction = pg.math.Vector2()
@@ -31,58 +66,55 @@ class Entity(pg.sprite.Sprite):
         self.time_last_hit = None
         self.bullet_damage = 1  # Default damage value
 
-        self.hit_sound = pg.mixer.Sound('./audio/hit.wav')
-        self.hit_sound.set_volume(0.2)
-        self.fire_sound = pg.mixer.Sound('./audio/bullet.wav')
-        self.fire_sound.set_volume(0.2)
-
     def blink(self):
         if not self.vulnerable and self.wave_val():
-            mask = pg.mask.from_surface(self.image)
-            white_surf = mask.to_surface()
-            white_surf.set_colorkey((0, 0, 0))
-            self.image = white_surf
+            self.image = self.flash_surfs[self.move_dir][int(self.frame_index)]
 
     def wave_val(self):
-        val = sin(pg.time.get_ticks())      
+        val = sin(clock.get_ticks())      
         return val >= 0
     
     def check_alive(self):
         if self.health <= 0:
             self.kill()
 
-    def damage(self):
+    def kill(self):
+        if self.alive():
+            super().kill()
+            self.release_assets()
+
+    def revive(self):
+        # A killed entity brought back by a snapshot restore takes its asset references back
+        self.import_assets(self.asset_path)
+
+    def release_assets(self):
+        registry.release(self.asset_path)
+
+    def damage(self, amount=None):
         if self.vulnerable:
             self.vulnerable = False
-            self.health -= getattr(self, 'bullet_damage', 1)
-            self.time_last_hit = pg.time.get_ticks()
-            self.hit_sound.play()
+            self.health -= amount if amount is not None else getattr(self, 'bullet_damage', 1)
+            self.time_last_hit = clock.get_ticks()
+            sounds.play('hit', self.rect)
 
     def animate(self, deltaTime):
         self.frame_index += 7 * deltaTime
         if self.frame_index >= len(self.animations[self.move_dir]):
             self.frame_index = 0
         self.image = self.animations[self.move_dir][int(self.frame_index)]
-        self.mask = pg.mask.from_surface(self.image)
+        self.mask = self.masks[self.move_dir][int(self.frame_index)]
 
     def blt_timer(self):
         if not self.can_shoot:
-            if pg.time.get_ticks() - self.blt_time > self.time_bw_shots:
+            if clock.get_ticks() - self.blt_time > self.time_bw_shots:
                 self.can_shoot = True
 
     def invulnerable_timer(self):
         if not self.vulnerable:
-            if pg.time.get_ticks() - self.time_last_hit > 500:
+            if clock.get_ticks() - self.time_last_hit > 500:
                 self.vulnerable = True
 
     def import_assets(self, asset_path):
-        self.animations = {}
-        for (index, folder) in enumerate(walk(asset_path)):
-            if index == 0:
-                for subfolder in folder[1]:
-                    self.animations[subfolder] = []
-            else:
-                img_path = asset_path + "/" + folder[0].split("\\")[1]
-                for img in sorted(folder[2], key=lambda string: int(string.split(".")[0])):
-                    surf = pg.image.load(f"{img_path}/{img}").convert_alpha()
-                    self.animations[folder[0].split("\\")[1]].append(surf)
\ No newline at end of file
+        # Frames, masks and flash surfaces are shared by every entity using the same folder; sounds live in the sound manager
+        self.asset_path = asset_path
+        self.animations, self.masks, self.flash_surfs = registry.acquire(asset_path, load_animation_set)
\ No newline at end of file
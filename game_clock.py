@@ -0,0 +1,12 @@
+class GameClock:
+    def __init__(self):
+        # Simulated time, advanced by the game loop rather than read from the wall clock
+        self.time = 0.0
+
+    def advance(self, deltaTime):
+        self.time += deltaTime
+
+    def get_ticks(self):
+        return int(self.time * 1000)
+
+clock = GameClock()
\ No newline at end of file
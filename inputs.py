@@ -0,0 +1,128 @@
+import json
+import struct
+import numpy as np
+import pygame as pg
+
+KEY_NAMES = {
+    'LEFT': pg.K_LEFT,
+    'RIGHT': pg.K_RIGHT,
+    'UP': pg.K_UP,
+    'DOWN': pg.K_DOWN,
+    'SPACE': pg.K_SPACE
+}
+
+class KeyState:
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class KeyboardInput:
+    def get_pressed(self):
+        return pg.key.get_pressed()
+
+class ScriptedInput:
+    def __init__(self, steps, loop=True):
+        # steps is a list of (frame_count, [key names]) pairs, e.g. (120, ["RIGHT", "SPACE"])
+        for (frames, names) in steps:
+            if frames <= 0:
+                raise ValueError(f"Script step {names} must last at least one frame, not {frames}")
+        self.steps = [(frames, KeyState(KEY_NAMES[name] for name in names)) for (frames, names) in steps]
+        self.loop = loop
+        self.step_index = 0
+        self.frames_left = self.steps[0][0] if self.steps else 0
+
+    @classmethod
+    def from_file(cls, path, loop=True):
+        with open(path) as f:
+            return cls(json.load(f), loop)
+
+    def get_pressed(self):
+        # Every call consumes one frame of the script
+        while self.frames_left <= 0:
+            if self.step_index + 1 < len(self.steps):
+                self.step_index += 1
+            elif self.loop and self.steps:
+                self.step_index = 0
+            else:
+                return KeyState()
+            self.frames_left = self.steps[self.step_index][0]
+        self.frames_left -= 1
+        return self.steps[self.step_index][1]
+
+# Recording file: header, then (frames, key bits) runs, (frame, kind) game events and the final outcome.
+# Key bits follow the order of KEY_NAMES
+RECORDING_MAGIC = b'CINP'
+RECORDING_VERSION = 1
+RECORDING_HEADER = struct.Struct('<4sHqHII')
+RUN_DTYPE = np.dtype([('frames', '<u4'), ('keys', 'u1')])
+EVENT_DTYPE = np.dtype([('frame', '<u4'), ('kind', 'u1')])
+EVENT_KINDS = ('reset', 'increase_difficulty')
+OUTCOME = struct.Struct('<7q')
+OUTCOME_FIELDS = ('frames', 'deaths', 'shots_fired', 'shots_hit', 'health', 'x', 'y')
+
+class InputRecording:
+    def __init__(self, seed, tick_rate, path=None):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.path = path
+        self.runs = []
+        self.events = []
+        self.outcome = None
+
+    def add_frame(self, keys):
+        # Run-length encoded: held keys only cost one entry per change
+        if self.runs and self.runs[-1][1] == keys:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, keys])
+
+    def add_event(self, kind, frame):
+        self.events.append((frame, EVENT_KINDS.index(kind)))
+
+    def steps(self):
+        # The runs as ScriptedInput steps
+        names = list(KEY_NAMES)
+        return [(frames, [name for (bit, name) in enumerate(names) if keys & (1 << bit)]) for (frames, keys) in self.runs]
+
+    def save(self, path=None):
+        path = path or self.path
+        runs = np.array([tuple(run) for run in self.runs], dtype=RUN_DTYPE)
+        events = np.array(self.events, dtype=EVENT_DTYPE)
+        outcome = self.outcome or {}
+        with open(path, 'wb') as f:
+            f.write(RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, self.seed, self.tick_rate, len(runs), len(events)))
+            f.write(runs.tobytes())
+            f.write(events.tobytes())
+            f.write(OUTCOME.pack(*(int(outcome.get(field, 0)) for field in OUTCOME_FIELDS)))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            magic, version, seed, tick_rate, run_count, event_count = RECORDING_HEADER.unpack(f.read(RECORDING_HEADER.size))
+            if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+                raise ValueError(f"{path} is not a version {RECORDING_VERSION} input recording")
+            recording = cls(seed, tick_rate, path)
+            runs = np.frombuffer(f.read(run_count * RUN_DTYPE.itemsize), dtype=RUN_DTYPE)
+            events = np.frombuffer(f.read(event_count * EVENT_DTYPE.itemsize), dtype=EVENT_DTYPE)
+            recording.runs = [[int(frames), int(keys)] for (frames, keys) in runs]
+            recording.events = [(int(frame), int(kind)) for (frame, kind) in events]
+            recording.outcome = dict(zip(OUTCOME_FIELDS, OUTCOME.unpack(f.read(OUTCOME.size))))
+        return recording
+
+class RecordingInput:
+    def __init__(self, source, recording):
+        # Passes the wrapped source through, writing down the key state of every frame
+        self.source = source
+        self.recording = recording
+        self.keys = list(KEY_NAMES.values())
+
+    def get_pressed(self):
+        pressed = self.source.get_pressed()
+        self.recording.add_frame(sum(1 << bit for (bit, key) in enumerate(self.keys) if pressed[key]))
+        return pressed
+
+class ReplayInput(ScriptedInput):
+    def __init__(self, recording):
+        super().__init__(recording.steps(), loop=False)
\ No newline at end of file
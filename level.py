@@ -0,0 +1,177 @@
+import os
+import pickle
+import hashlib
+import zlib
+from xml.etree import ElementTree
+from array import array
+import pygame as pg
+from pytmx import TiledTileLayer, TiledObjectGroup
+from pytmx.util_pygame import load_pygame
+
+CACHE_VERSION = 2
+ATLAS_WIDTH = 2048
+
+class LevelObject:
+    def __init__(self, name, x, y, width, height, image=None):
+        self.name = name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.image = image
+
+class Level:
+    def __init__(self, width, height, tilewidth, tileheight, layers, objects, tile_images):
+        self.width = width
+        self.height = height
+        self.tilewidth = tilewidth
+        self.tileheight = tileheight
+        self.layers = layers
+        self.objects = objects
+        self.tile_images = tile_images
+
+    def tiles(self, layer_name):
+        # Same (x, y, surface) triples as pytmx's TiledTileLayer.tiles()
+        gids = self.layers[layer_name]
+        for (index, gid) in enumerate(gids):
+            if gid and gid in self.tile_images:
+                yield (index % self.width, index // self.width, self.tile_images[gid])
+
+    def get_objects(self, layer_name):
+        return self.objects[layer_name]
+
+def cache_path_for(tmx_path):
+    return os.path.splitext(tmx_path)[0] + '.lvl'
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, file_hash(path))
+
+def pack_atlas(images):
+    # Simple shelf packing, tallest images first
+    placements = {}
+    x = y = shelf_height = 0
+    for (gid, surf) in sorted(images.items(), key=lambda item: -item[1].get_height()):
+        width, height = surf.get_size()
+        if x + width > ATLAS_WIDTH:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        placements[gid] = (x, y, width, height)
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    width = max([left + w for (left, top, w, h) in placements.values()], default=1)
+    atlas = pg.Surface((width, max(1, y + shelf_height)), pg.SRCALPHA)
+    for (gid, (x, y, width, height)) in placements.items():
+        atlas.blit(images[gid], (x, y))
+    return atlas, placements
+
+def compile_level(tmx_path):
+    tmx_map = load_pygame(tmx_path)
+
+    layers = {}
+    objects = {}
+    used_images = {}
+    for layer in tmx_map.layers:
+        if isinstance(layer, TiledTileLayer):
+            gids = array('I', (gid for row in layer.data for gid in row))
+            layers[layer.name] = gids.tobytes()
+            for gid in set(gids):
+                image = tmx_map.images[gid] if gid else None
+                if image is not None:
+                    used_images[gid] = image
+        elif isinstance(layer, TiledObjectGroup):
+            objects[layer.name] = []
+            for obj in layer:
+                gid = obj.gid if obj.image is not None else 0
+                if gid:
+                    used_images[gid] = obj.image
+                objects[layer.name].append((obj.name, obj.x, obj.y, obj.width, obj.height, gid))
+
+    atlas, placements = pack_atlas(used_images)
+
+    # Everything the compiled level was built from, to invalidate the cache on change
+    map_dir = os.path.dirname(tmx_path)
+    sources = [tmx_path]
+    # pytmx replaces an external tileset's .tsx path with its image path, so those are read from the map itself
+    for node in ElementTree.parse(tmx_path).getroot().iter('tileset'):
+        if node.get('source'):
+            sources.append(os.path.join(map_dir, node.get('source')))
+    image_sources = [tileset.source for tileset in tmx_map.tilesets]
+    # Image collection tilesets give each tile its own file
+    image_sources.extend(properties.get('source') for properties in tmx_map.tile_properties.values())
+    for source in image_sources:
+        image_path = os.path.join(map_dir, source) if source else None
+        if image_path and os.path.exists(image_path) and image_path not in sources:
+            sources.append(image_path)
+
+    return {
+        'version': CACHE_VERSION,
+        'sources': {path: source_stamp(path) for path in sources},
+        'size': (tmx_map.width, tmx_map.height, tmx_map.tilewidth, tmx_map.tileheight),
+        'layers': layers,
+        'objects': objects,
+        'atlas': (atlas.get_size(), zlib.compress(pg.image.tobytes(atlas, 'RGBA'))),
+        'placements': placements
+    }
+
+def cache_is_valid(data):
+    if data.get('version') != CACHE_VERSION:
+        return False
+    for (path, (mtime, size, digest)) in data['sources'].items():
+        if not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        # A touched but unchanged file still matches by content hash
+        if (stat.st_mtime_ns, stat.st_size) != (mtime, size) and file_hash(path) != digest:
+            return False
+    return True
+
+def build_level(data):
+    atlas_size, atlas_bytes = data['atlas']
+    atlas = pg.image.frombytes(zlib.decompress(atlas_bytes), atlas_size, 'RGBA')
+    if pg.display.get_surface() is not None:
+        atlas = atlas.convert_alpha()
+    tile_images = {gid: atlas.subsurface(rect) for (gid, rect) in data['placements'].items()}
+
+    layers = {}
+    for (name, gid_bytes) in data['layers'].items():
+        gids = array('I')
+        gids.frombytes(gid_bytes)
+        layers[name] = gids
+
+    objects = {}
+    for (name, entries) in data['objects'].items():
+        objects[name] = [
+            LevelObject(obj_name, x, y, width, height, tile_images.get(gid))
+            for (obj_name, x, y, width, height, gid) in entries
+        ]
+
+    width, height, tilewidth, tileheight = data['size']
+    return Level(width, height, tilewidth, tileheight, layers, objects, tile_images)
+
+def load_level(tmx_path):
+    cache_path = cache_path_for(tmx_path)
+    data = None
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Failed to read level cache: {e}")
+            data = None
+
+    if data is None or not cache_is_valid(data):
+        data = compile_level(tmx_path)
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Failed to write level cache: {e}")
+
+    return build_level(data)
\ No newline at end of file
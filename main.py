@@ -1,104 +1,250 @@
 import pygame as pg
 import settings as st
 import sys
-from tiles import Tile, TileForCollision, MovingPlatform
+import os
+import time
+import argparse
+import random
+from math import floor
+from tiles import TileForCollision, MovingPlatform, StaticLayer
 from player import Player
-from enemy import Enemy
-from bullet import Bullet, BulletAnimation
+from enemy import Enemy, EnemySquad
+from bullet import BulletSystem, FlashPool
 from health import Health
-from pytmx.util_pygame import load_pygame
+from assets import registry
+from sound_manager import sounds
+from text_cache import text_cache
+from spatial import SpatialHash, CollisionGroup, TerrainGrid
+from level import load_level
+from snapshot import WorldSnapshot
+from game_clock import clock
+from inputs import ScriptedInput, KeyboardInput, InputRecording, RecordingInput, ReplayInput
+from profiler import FrameProfiler
+from dirty_rects import DirtyRects
+from parallax import ParallaxLayer
 
 class AllSprites(pg.sprite.Group):
-    def __init__(self):
+    def __init__(self, level):
         super().__init__()
         self.display_surface = pg.display.get_surface()
         self.offset = pg.math.Vector2()
-        self.sky_fg = pg.image.load('./graphics/sky/fg_sky.png').convert_alpha()
-        self.sky_bg = pg.image.load('./graphics/sky/bg_sky.png').convert_alpha()
-        self.margin = st.WINDOW_WIDTH / 2
-        tmx_map = load_pygame('./data/map.tmx')
-        map_width = tmx_map.tilewidth * tmx_map.width + 2 * self.margin
-        self.sky_width = self.sky_bg.get_width()
-        self.sky_blit_num = int(map_width // self.sky_width)
-
-    def custom_draw(self, player):
-        self.offset.x = player.rect.centerx - st.WINDOW_WIDTH / 2
-        self.offset.y = player.rect.centery - st.WINDOW_HEIGHT / 2
-
-        for i in range(self.sky_blit_num):
-            pos_x = -self.margin + (i * self.sky_width)
-            self.display_surface.blit(self.sky_bg, (pos_x - (self.offset.x / 3), (650 - self.offset.y / 3)))
-            self.display_surface.blit(self.sky_fg, (pos_x - (self.offset.x / 2), (850 - self.offset.y / 2)))
-
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.z):
-            offset_rect = sprite.image.get_rect(center=sprite.rect.center)
-            offset_rect.center -= self.offset
-            self.display_surface.blit(sprite.image, offset_rect)
+        sky_fg = registry.image('./graphics/sky/fg_sky.png')
+        sky_bg = registry.image('./graphics/sky/bg_sky.png')
+        margin = st.WINDOW_WIDTH / 2
+        map_width = level.tilewidth * level.width + 2 * margin
+        sky_width = sky_bg.get_width()
+        sky_blit_num = int(map_width // sky_width)
+        self.sky_layers = [
+            ParallaxLayer(sky_bg, 3, 650, -margin, sky_blit_num),
+            ParallaxLayer(sky_fg, 2, 850, -margin, sky_blit_num, spacing=sky_width)
+        ]
+        self.static_layers = {}
+
+        # Sprites are kept in per-z spatial buckets so drawing never has to sort them
+        # and only looks at the cells around the viewport
+        self.buckets = {}
+        self.sprite_layers = {}
+        self.sprite_order = {}
+        self.moving_sprites = {}
+        self.pending = {}
+        self.draw_order = []
+        self.added_count = 0
+        self.batches = {}
+
+        # Centers of moving sprites before the latest simulation step, for interpolation
+        self.previous_centers = {}
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        # z is assigned after a sprite joins its groups, so it is bucketed on the next draw
+        self.pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if sprite in self.pending:
+            del self.pending[sprite]
+        else:
+            self.buckets[self.sprite_layers.pop(sprite)].remove(sprite)
+            self.moving_sprites.pop(sprite, None)
+            self.previous_centers.pop(sprite, None)
+            del self.sprite_order[sprite]
+
+    def add_static_layer(self, layer):
+        self.static_layers.setdefault(layer.z, []).append(layer)
+        self.update_draw_order()
+
+    def add_batch(self, batch):
+        # Objects that hand over many blits at once (like bullets), drawn above the sprites of their z
+        self.batches.setdefault(batch.z, []).append(batch)
+        self.update_draw_order()
+
+    def update_draw_order(self):
+        self.draw_order = sorted(set(self.static_layers) | set(self.buckets) | set(self.batches))
+
+    def flush_pending(self):
+        for sprite in self.pending:
+            if sprite.z not in self.buckets:
+                self.buckets[sprite.z] = SpatialHash(st.RENDER_CELL_SIZE)
+                self.update_draw_order()
+            self.buckets[sprite.z].insert(sprite, sprite.rect)
+            self.sprite_layers[sprite] = sprite.z
+            self.sprite_order[sprite] = self.added_count
+            self.added_count += 1
+            if getattr(sprite, 'moving', True):
+                self.moving_sprites[sprite] = None
+        self.pending.clear()
+
+    def save_positions(self):
+        self.flush_pending()
+        for sprite in self.moving_sprites:
+            self.previous_centers[sprite] = sprite.rect.center
+
+    def draw_center(self, sprite, alpha):
+        center = sprite.rect.center
+        previous = self.previous_centers.get(sprite)
+        if previous is None:
+            return center
+        return (previous[0] + (center[0] - previous[0]) * alpha, previous[1] + (center[1] - previous[1]) * alpha)
+
+    def visible_sprites(self, z, view_rect):
+        visible = self.buckets[z].query(view_rect)
+        return sorted(visible, key=self.sprite_order.__getitem__)
+
+    def custom_draw(self, player, alpha=1.0, dirty=None):
+        # Floored once so layers, sprites, bullets and the sky all share one whole-pixel camera
+        player_x, player_y = self.draw_center(player, alpha)
+        self.offset.x = floor(player_x - st.WINDOW_WIDTH / 2)
+        self.offset.y = floor(player_y - st.WINDOW_HEIGHT / 2)
+
+        self.flush_pending()
+        for sprite in self.moving_sprites:
+            self.buckets[self.sprite_layers[sprite]].move(sprite, sprite.rect)
+
+        offset_x, offset_y = int(self.offset.x), int(self.offset.y)
+        self.camera_rect = pg.Rect(offset_x, offset_y, st.WINDOW_WIDTH, st.WINDOW_HEIGHT)
+        view_rect = self.camera_rect.inflate(2 * st.RENDER_MARGIN, 2 * st.RENDER_MARGIN)
+
+        blit_lists = {}
+        for z in self.draw_order:
+            blit_list = []
+            if z in self.buckets:
+                for sprite in self.visible_sprites(z, view_rect):
+                    center_x, center_y = self.draw_center(sprite, alpha)
+                    blit_list.append((sprite.image, (center_x - sprite.image.get_width() // 2 - offset_x,
+                                                     center_y - sprite.image.get_height() // 2 - offset_y)))
+            for batch in self.batches.get(z, ()):
+                blit_list.extend(batch.blit_list(self.offset, view_rect, alpha))
+            blit_lists[z] = blit_list
+
+        # With dirty rects on, a still camera only redraws where sprites are or just were
+        clips = [None]
+        if dirty is not None:
+            rects = []
+            for blit_list in blit_lists.values():
+                rects.extend(pg.Rect(pos, image.get_size()).inflate(2, 2) for (image, pos) in blit_list)
+            clips = dirty.begin_frame((offset_x, offset_y), rects)
+
+        for clip in clips:
+            self.display_surface.set_clip(clip)
+            self.display_surface.fill(st.BG_COLOR)
+            for layer in self.sky_layers:
+                layer.draw(self.display_surface, self.offset)
+
+            # Baked layers are drawn beneath the sprites that share their z
+            for z in self.draw_order:
+                for layer in self.static_layers.get(z, ()):
+                    layer.draw(self.display_surface, self.offset)
+                self.display_surface.blits(blit_lists[z], doreturn=False)
+        self.display_surface.set_clip(None)
 
 class GameWindow:
-    def __init__(self):
+    def __init__(self, headless=False, input_source=None, level=None, dirty_rects=st.DIRTY_RECTS, seed=None, recording=None):
+        # Headless runs still need a display surface for convert_alpha, so SDL's dummy drivers are used
+        self.headless = headless
+        self.input_source = input_source
+        # Seed for anything random in a session (the DifficultyManager), kept so recordings can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.recording = recording
+        self.frame_count = 0
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
         pg.init()
         self.display_surface = pg.display.set_mode((st.WINDOW_WIDTH, st.WINDOW_HEIGHT))
         pg.display.set_caption("Contra")
         self.clk = pg.time.Clock()
+        self.profiler = FrameProfiler()
+        self.dirty = DirtyRects(self.display_surface) if dirty_rects else None
 
-        self.all_sprites = AllSprites()
-        self.coll_grp = pg.sprite.Group()
+        self.level = level or load_level('./data/map.tmx')
+        self.all_sprites = AllSprites(self.level)
+        self.coll_grp = CollisionGroup()
         self.mov_platforms_grp = pg.sprite.Group()
-        self.bullet_grp = pg.sprite.Group()
         self.vulnerable_grp = pg.sprite.Group()
+        self.enemy_squad = EnemySquad()
 
         self.setup()
         self.health_bar = Health(self.my_player)
 
-        self.bullet_surf = pg.image.load('./graphics/bullet.png').convert_alpha()
-        self.fire_surfs = [
-            pg.image.load('./graphics/fire/0.png').convert_alpha(),
-            pg.image.load('./graphics/fire/1.png').convert_alpha()
-        ]
+        self.bullet_surf = registry.image('./graphics/bullet.png')
+        self.fire_surfs = registry.images(['./graphics/fire/0.png', './graphics/fire/1.png'])
+        self.bullets = BulletSystem(self.bullet_surf)
+        self.flash_pool = FlashPool(self.fire_surfs)
+        self.all_sprites.add_batch(self.bullets)
 
-        self.bg_music = pg.mixer.Sound('./audio/music.wav')
-        self.bg_music.play(loops=-1)
+        sounds.setup()
+        sounds.register('music', './audio/music.wav', 'music')
+        sounds.register('fire', './audio/bullet.wav', 'weapons', volume=0.2, max_voices=4)
+        sounds.register('hit', './audio/hit.wav', 'hits', volume=0.2, max_voices=3)
+        sounds.play('music', loops=-1)
 
         # Game state variables
-        self.start_time = pg.time.get_ticks()
+        self.start_time = clock.get_ticks()
         self.shots_fired = 0
         self.shots_hit = 0
         self.game_over = False
         self.difficulty_increased = False
+        self.deaths = 0
         self.font = pg.font.SysFont('Arial', 30)
 
+        # Restarting restores this instead of rebuilding the whole game
+        self.initial_state = WorldSnapshot(self.all_sprites.sprites())
+
     def setup(self):
-        tmx_map = load_pygame('./data/map.tmx')
+        level = self.level
 
-        for (x, y, surf) in tmx_map.get_layer_by_name("Level").tiles():
-            TileForCollision((x * 64, y * 64), surf, [self.all_sprites, self.coll_grp])
+        self.terrain = TerrainGrid(level.width, level.height)
+        for (x, y, surf) in level.tiles("Level"):
+            tile = TileForCollision((x * 64, y * 64), surf, self.coll_grp)
+            self.terrain.fill(tile.rect)
 
-        for layer in ["BG", "BG Detail", "FG Detail Bottom", "FG Detail Top"]:
-            for (x, y, surf) in tmx_map.get_layer_by_name(layer).tiles():
-                Tile((x * 64, y * 64), surf, self.all_sprites, layer)        
+        for layer in ["BG", "BG Detail", "Level", "FG Detail Bottom", "FG Detail Top"]:
+            tiles = [((x * 64, y * 64), surf) for (x, y, surf) in level.tiles(layer)]
+            self.all_sprites.add_static_layer(StaticLayer(tiles, layer))
 
-        for obj in tmx_map.get_layer_by_name("Entities"):
+        for obj in level.get_objects("Entities"):
             if obj.name == "Player":
                 self.my_player = Player(
                     (obj.x, obj.y), 
                     "./graphics/player", 
                     [self.all_sprites, self.vulnerable_grp], 
                     self.coll_grp, 
-                    self.fire_bullet
+                    self.fire_bullet,
+                    input_source=self.input_source
                 )
             elif obj.name == "Enemy":
                 Enemy(
                     (obj.x, obj.y), 
                     "./graphics/enemy", 
-                    [self.all_sprites, self.vulnerable_grp], 
+                    [self.all_sprites, self.vulnerable_grp, self.enemy_squad], 
                     self.fire_bullet, 
                     self.my_player, 
                     coll_sprites=self.coll_grp
                 )
 
         self.border_rect_list = []
-        for obj in tmx_map.get_layer_by_name("Platforms"):
+        for obj in level.get_objects("Platforms"):
             if obj.name == "Platform":
                 MovingPlatform((obj.x, obj.y), obj.image, [self.all_sprites, self.coll_grp, self.mov_platforms_grp])
             else:
@@ -125,43 +271,51 @@ class GameWindow:
 
     def fire_bullet(self, position, dir, shooter):
         is_player = shooter == self.my_player
-        Bullet(position, self.bullet_surf, dir, [self.all_sprites, self.bullet_grp], is_player_shot=is_player)
-        BulletAnimation(entity=shooter, surface_list=self.fire_surfs, dir=dir, groups=self.all_sprites)
+        self.bullets.spawn(
+            (int(position[0]), int(position[1])),
+            dir,
+            clock.get_ticks(),
+            is_player_shot=is_player,
+            speed=getattr(shooter, 'bullet_speed', 500),
+            damage=shooter.bullet_damage
+        )
+        self.flash_pool.get_flash(shooter, dir, self.all_sprites)
 
     def bullet_collisions(self):
-        for bullet in self.bullet_grp:
-            if bullet.is_player_shot:
-                self.shots_fired += 1
-                break
+        if self.bullets.any_player_shots():
+            self.shots_fired += 1
         
-        for obst in self.coll_grp.sprites():
-            pg.sprite.spritecollide(obst, self.bullet_grp, True)
+        # All bullets are tested at once against the terrain grid, platforms and entity rects
+        self.bullets.collide_terrain(self.terrain, self.mov_platforms_grp.sprites())
         
-        for sprite in self.vulnerable_grp.sprites():
-            if pg.sprite.spritecollide(sprite, self.bullet_grp, True, pg.sprite.collide_mask):
-                if sprite != self.my_player:
-                    self.shots_hit += 1
-                sprite.damage()
+        for (sprite, damage) in self.bullets.collide_sprites(self.vulnerable_grp.sprites()):
+            if sprite != self.my_player:
+                self.shots_hit += 1
+            sprite.damage(damage)
 
     def display_game_stats(self):
-        current_time = (pg.time.get_ticks() - self.start_time) // 1000
+        current_time = (clock.get_ticks() - self.start_time) // 1000
         minutes = current_time // 60
         seconds = current_time % 60
         timer_text = f"Time: {minutes}:{seconds:02d}"
-        timer_surf = self.font.render(timer_text, True, (255, 255, 255))
-        self.display_surface.blit(timer_surf, (st.WINDOW_WIDTH - 200, 10))
+        timer_surf = text_cache.render(self.font, timer_text, (255, 255, 255))
+        timer_rect = self.display_surface.blit(timer_surf, (st.WINDOW_WIDTH - 200, 10))
 
         accuracy = (self.shots_hit / self.shots_fired * 100) if self.shots_fired > 0 else 0
         accuracy_text = f"Accuracy: {accuracy:.1f}%"
-        accuracy_surf = self.font.render(accuracy_text, True, (255, 255, 255))
-        self.display_surface.blit(accuracy_surf, (st.WINDOW_WIDTH - 200, 50))
+        accuracy_surf = text_cache.render(self.font, accuracy_text, (255, 255, 255))
+        accuracy_rect = self.display_surface.blit(accuracy_surf, (st.WINDOW_WIDTH - 200, 50))
+        return [timer_rect, accuracy_rect]
 
     def check_game_over_conditions(self):
         if self.my_player.health <= 0 and not self.game_over:
             self.game_over = True
-            current_time = (pg.time.get_ticks() - self.start_time) // 1000
+            self.deaths += 1
+            current_time = (clock.get_ticks() - self.start_time) // 1000
             accuracy = (self.shots_hit / self.shots_fired * 100) if self.shots_fired > 0 else 0
             
+            if self.headless:
+                return False
             if accuracy > 1 and current_time < st.CHALLENGE_PARAMS['time_limit']:
                 return self.show_prompt("Challenge Complete! Increase difficulty? (Y/N)")
             else:
@@ -170,7 +324,7 @@ class GameWindow:
         return False
 
     def show_prompt(self, message):
-        prompt = self.font.render(message, True, (255, 255, 0))
+        prompt = text_cache.render(self.font, message, (255, 255, 0))
         self.display_surface.blit(prompt, (st.WINDOW_WIDTH//2 - 200, st.WINDOW_HEIGHT//2))
         pg.display.update()
         
@@ -183,57 +337,220 @@ class GameWindow:
                     elif event.key == pg.K_n:
                         return False
                 elif event.type == pg.QUIT:
-                    pg.quit()
-                    sys.exit()
+                    self.quit()
         return False
 
     def show_message(self, message):
-        msg = self.font.render(message, True, (255, 0, 0))
+        msg = text_cache.render(self.font, message, (255, 0, 0))
         self.display_surface.blit(msg, (st.WINDOW_WIDTH//2 - 150, st.WINDOW_HEIGHT//2))
         pg.display.update()
         pg.time.delay(2000)  # Show message for 2 seconds
 
     def increase_difficulty(self):
-        for enemy in [s for s in self.vulnerable_grp if isinstance(s, Enemy)]:
+        for enemy in self.enemy_squad.sprites():
             enemy.bullet_damage = st.CHALLENGE_PARAMS['damage_increase']
             enemy.bullet_speed = st.CHALLENGE_PARAMS['speed_increase']
         self.difficulty_increased = True
+        if self.recording:
+            self.recording.add_event('increase_difficulty', self.frame_count)
 
     def reset_game(self):
-        self.__init__()
-        self.runGame()
+        if self.recording:
+            self.recording.add_event('reset', self.frame_count)
+        self.initial_state.restore(self.all_sprites)
+        # Anything the restored world no longer references is freed
+        registry.purge()
+        self.bullets.clear()
+        self.enemy_squad.refresh()
+        self.all_sprites.previous_centers.clear()
+        self.start_time = clock.get_ticks()
+        self.shots_fired = 0
+        self.shots_hit = 0
+        self.game_over = False
+        self.difficulty_increased = False
+        if self.dirty:
+            self.dirty.invalidate()
+
+    def update_world(self, dt):
+        self.frame_count += 1
+        clock.advance(dt)
+        self.platform_restriction()
+        self.coll_grp.refresh()
+        self.profiler.mark('platform_restriction')
+        self.bullets.update(dt, clock.get_ticks())
+        self.profiler.mark('bullets')
+        if self.profiler.enabled:
+            self.profiler.update_by_class(self.all_sprites, dt)
+        else:
+            self.all_sprites.update(dt)
+        self.enemy_squad.think(self.my_player)
+        self.profiler.mark('enemy_ai')
+        self.bullet_collisions()
+        self.profiler.mark('bullet_collisions')
+
+    def run_headless(self, frames, dt=1 / st.TICK_RATE):
+        # Fixed-dt updates as fast as the CPU allows, with no drawing and no frame cap
+        deaths = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            pg.event.pump()
+            self.update_world(dt)
+            self.check_game_over_conditions()
+            if self.game_over:
+                deaths += 1
+                self.reset_game()
+        elapsed = time.perf_counter() - start
+
+        return {
+            'frames': frames,
+            'simulated_seconds': frames * dt,
+            'wall_seconds': elapsed,
+            'simulated_fps': frames / elapsed if elapsed > 0 else float('inf'),
+            'deaths': deaths
+        }
+
+    def outcome(self):
+        return {
+            'frames': self.frame_count,
+            'deaths': self.deaths,
+            'shots_fired': self.shots_fired,
+            'shots_hit': self.shots_hit,
+            'health': self.my_player.health,
+            'x': self.my_player.rect.x,
+            'y': self.my_player.rect.y
+        }
+
+    def run_replay(self, recording):
+        # Steps through a recorded session headlessly at its own tick rate, applying its restarts on the frames they happened
+        dt = 1 / recording.tick_rate
+        events = list(recording.events)
+        frames = recording.outcome['frames']
+        start = time.perf_counter()
+        while True:
+            while events and events[0][0] == self.frame_count:
+                (frame, kind) = events.pop(0)
+                if kind == 0:
+                    self.reset_game()
+                else:
+                    self.increase_difficulty()
+            if self.frame_count >= frames:
+                break
+            pg.event.pump()
+            self.update_world(dt)
+            self.check_game_over_conditions()
+        elapsed = time.perf_counter() - start
+        return (self.outcome(), elapsed)
+
+    def quit(self):
+        if self.recording:
+            self.recording.outcome = self.outcome()
+            self.recording.save()
+        pg.quit()
+        sys.exit()
 
     def runGame(self):
+        # Simulation advances in fixed steps, rendering interpolates between the last two
+        step = 1 / st.TICK_RATE
+        accumulator = 0
         while True:
+            self.profiler.start_frame()
             for event in pg.event.get():
                 if event.type == pg.QUIT:
-                    pg.quit()
-                    sys.exit()
+                    self.quit()
+                if event.type == pg.KEYDOWN:
+                    if event.key == pg.K_F3:
+                        self.profiler.toggle()
+                        # The overlay panel is not tracked as a dirty rect, so hiding it needs a full redraw
+                        if self.dirty:
+                            self.dirty.invalidate()
+                    elif event.key == pg.K_F4:
+                        self.profiler.dump_trace()
                 if self.game_over and event.type == pg.KEYDOWN:
                     if event.key == pg.K_r:
                         self.reset_game()
+            self.profiler.mark('events')
             
-            dt = self.clk.tick(120)/1000
-            self.display_surface.fill((249, 131, 103))
+            accumulator += self.clk.tick(st.RENDER_FPS)/1000
+            self.profiler.mark('frame_wait')
 
             if not self.game_over:
-                self.platform_restriction()
-                self.all_sprites.update(dt)
-                self.bullet_collisions()
-                
-                if self.check_game_over_conditions():
-                    self.increase_difficulty()
-                    self.reset_game()
+                steps = 0
+                while accumulator >= step and steps < st.MAX_CATCH_UP_STEPS and not self.game_over:
+                    self.all_sprites.save_positions()
+                    self.update_world(step)
+                    accumulator -= step
+                    steps += 1
+
+                    if self.check_game_over_conditions():
+                        self.reset_game()
+                        self.increase_difficulty()
+                    self.profiler.mark('check_game_over_conditions')
+
+                # Past the catch-up cap the backlog is dropped instead of spiralling
+                if steps == st.MAX_CATCH_UP_STEPS:
+                    accumulator = min(accumulator, step)
             else:
-                restart_msg = self.font.render("Press R to restart", True, (255, 255, 255))
-                self.display_surface.blit(restart_msg, (st.WINDOW_WIDTH//2 - 100, st.WINDOW_HEIGHT//2 + 50))
+                accumulator = 0
+
+            # Messages and the profiler overlay draw outside the tracked rects
+            if self.dirty and (self.game_over or self.profiler.show_overlay):
+                self.dirty.invalidate()
 
-            self.all_sprites.custom_draw(self.my_player)
-            self.health_bar.display_health()
-            self.display_game_stats()
+            self.all_sprites.custom_draw(self.my_player, accumulator / step, self.dirty)
+            sounds.set_view(self.all_sprites.camera_rect)
+            self.profiler.mark('draw')
+            hud_rects = self.health_bar.display_health() + self.display_game_stats()
+            if self.game_over:
+                restart_msg = text_cache.render(self.font, "Press R to restart", (255, 255, 255))
+                self.display_surface.blit(restart_msg, (st.WINDOW_WIDTH//2 - 100, st.WINDOW_HEIGHT//2 + 50))
+            self.profiler.mark('hud')
+            self.profiler.draw_overlay(self.display_surface)
+            self.profiler.mark('overlay')
 
-            pg.display.update()
+            if self.dirty:
+                self.dirty.add(hud_rects)
+                self.dirty.update_display()
+            else:
+                pg.display.update()
+            self.profiler.mark('display.update')
+            self.profiler.end_frame()
 
 if __name__ == "__main__":
-    window = GameWindow()
-    window.runGame()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Contra")
+    parser.add_argument('--headless', action='store_true', help="simulate without a window, as fast as possible")
+    parser.add_argument('--frames', type=int, default=120 * 60, help="frames to simulate in headless mode")
+    parser.add_argument('--script', help="JSON list of [frame_count, [key names]] steps used as player input")
+    parser.add_argument('--record', help="save this session's input to a file that --replay can play back")
+    parser.add_argument('--replay', help="replay a recorded session headlessly as fast as possible")
+    parser.add_argument('--dirty-rects', action='store_true', default=st.DIRTY_RECTS,
+                        help="only update the changed parts of the window while the camera is still")
+    args = parser.parse_args()
+
+    input_source = ScriptedInput.from_file(args.script) if args.script else None
+    if args.replay:
+        recording = InputRecording.load(args.replay)
+        window = GameWindow(headless=True, input_source=ReplayInput(recording), seed=recording.seed)
+        outcome, elapsed = window.run_replay(recording)
+        print(f"Replayed {outcome['frames']} frames in {elapsed:.2f}s: {outcome['frames'] / max(elapsed, 1e-9):.0f} fps")
+        if outcome == recording.outcome:
+            print("Outcome matches the recording")
+        else:
+            print(f"Outcome differs from the recording: {outcome} != {recording.outcome}")
+            sys.exit(1)
+    else:
+        recording = None
+        seed = random.randrange(2 ** 32)
+        if args.record:
+            recording = InputRecording(seed, st.TICK_RATE, args.record)
+            input_source = RecordingInput(input_source or KeyboardInput(), recording)
+        window = GameWindow(headless=args.headless, input_source=input_source, dirty_rects=args.dirty_rects,
+                            seed=seed, recording=recording)
+        if args.headless:
+            stats = window.run_headless(args.frames)
+            print(f"Simulated {stats['frames']} frames ({stats['simulated_seconds']:.1f}s) in "
+                  f"{stats['wall_seconds']:.2f}s: {stats['simulated_fps']:.0f} fps, {stats['deaths']} deaths")
+            if recording:
+                recording.outcome = window.outcome()
+                recording.save()
+        else:
+            window.runGame()
\ No newline at end of file
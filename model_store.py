@@ -0,0 +1,101 @@
+import os
+import time
+import atexit
+import pickle
+import struct
+import tempfile
+import threading
+import numpy as np
+
+# Header: magic, format version, dtype code, number of dims, then one uint32 per dim, padded to DATA_OFFSET
+MAGIC = b'CQTB'
+VERSION = 1
+DATA_OFFSET = 64
+DTYPE = np.dtype('<f4')
+
+def write_model(path, values):
+    # Written next to the target and renamed over it, so a crash never leaves a half-written model
+    values = np.ascontiguousarray(values, dtype=DTYPE)
+    header = MAGIC + struct.pack('<HcB', VERSION, b'f', values.ndim) + struct.pack(f'<{values.ndim}I', *values.shape)
+    header = header.ljust(DATA_OFFSET, b'\0')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.model-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(values.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def read_header(f):
+    header = f.read(DATA_OFFSET)
+    if len(header) < DATA_OFFSET or header[:4] != MAGIC:
+        return None
+    version, dtype_code, ndim = struct.unpack('<HcB', header[4:8])
+    if version != VERSION:
+        raise ValueError(f"Unsupported model version {version}")
+    return struct.unpack(f'<{ndim}I', header[8:8 + 4 * ndim])
+
+def read_model(path):
+    # Returns the stored array, or the unpickled object for models saved before the binary format
+    with open(path, 'rb') as f:
+        shape = read_header(f)
+        if shape is None:
+            f.seek(0)
+            return pickle.load(f)
+    values = np.memmap(path, dtype=DTYPE, mode='r', offset=DATA_OFFSET, shape=shape)
+    # Copied out so the file is not held open (and can be replaced) while the game runs
+    result = np.array(values, dtype=float)
+    del values
+    return result
+
+class ModelWriter:
+    def __init__(self, path, delay=2.0):
+        # Saves run on a background thread; requests within `delay` seconds of each other collapse into one write
+        self.path = path
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.pending = None
+        self.last_request = 0
+        self.thread = threading.Thread(target=self.run, name='model-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)
+
+    def request_save(self, values):
+        with self.lock:
+            self.pending = np.array(values, dtype=DTYPE)
+            self.last_request = time.monotonic()
+        self.wake.set()
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            while True:
+                with self.lock:
+                    wait = self.last_request + self.delay - time.monotonic()
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            self.flush()
+
+    def flush(self):
+        # Also called at exit, so a save still waiting out its delay is not lost
+        with self.write_lock:
+            with self.lock:
+                values, self.pending = self.pending, None
+            if values is None:
+                return
+            try:
+                write_model(self.path, values)
+                print("Difficulty model saved successfully")
+            except Exception as e:
+                print(f"Failed to save difficulty model: {e}")
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pygame as pg
+import settings as st
+from math import ceil, floor
+
+class ParallaxLayer:
+    def __init__(self, surface, factor, y, start_x, count, spacing=None, cache=st.SKY_CACHE):
+        # `count` copies of the strip are laid out from start_x, `spacing` apart, and scroll at 1 / factor of the camera
+        self.surface = surface
+        self.factor = factor
+        self.y = y
+        self.start_x = start_x
+        self.count = count
+        self.spacing = spacing or surface.get_width()
+        self.height = surface.get_height()
+        self.tiles = None
+        if cache and self.spacing >= surface.get_width():
+            self.build_cache()
+
+    def build_cache(self):
+        # Enough copies to cover the widest view, so a frame is drawn with a single blit
+        copies = ceil(st.WINDOW_WIDTH / self.spacing) + 1
+        self.tiles = pg.Surface((copies * self.spacing, self.height), pg.SRCALPHA)
+        for i in range(copies):
+            self.tiles.blit(self.surface, (i * self.spacing, 0), special_flags=pg.BLEND_RGBA_MAX)
+
+    def visible_range(self, scroll_x, view):
+        # Copy i sits at start_x + i * spacing - scroll_x; only those overlapping the view are returned
+        first = floor((view.left + scroll_x - self.start_x) / self.spacing)
+        last = floor((view.right - 1 + scroll_x - self.start_x) / self.spacing)
+        return max(0, first), min(self.count - 1, last)
+
+    def draw(self, surface, offset):
+        scroll_x = offset.x / self.factor
+        y = self.y - offset.y / self.factor
+        view = surface.get_clip()
+        if y >= view.bottom or y + self.height <= view.top:
+            return
+
+        first, last = self.visible_range(scroll_x, view)
+        if first > last:
+            return
+        if self.tiles is not None:
+            width = (last - first) * self.spacing + self.surface.get_width()
+            surface.blit(self.tiles, (self.start_x + first * self.spacing - scroll_x, y), pg.Rect(0, 0, width, self.height))
+        else:
+            for i in range(first, last + 1):
+                surface.blit(self.surface, (self.start_x + i * self.spacing - scroll_x, y))
\ No newline at end of file
@@ -1,15 +1,22 @@
 import pygame as pg
 import settings as st
+from game_clock import clock
 from os import walk
 from entity import Entity
+from sound_manager import sounds
+from inputs import KeyboardInput
 import sys
 
 class Player(Entity):
-    def __init__(self, position, asset_path, groups, coll_sprites, create_bullet):
+    state_attrs = Entity.state_attrs + ('on_ground', 'moving_floor')
+
+    def __init__(self, position, asset_path, groups, coll_sprites, create_bullet, input_source=None):
         super().__init__(position=position, asset_path=asset_path, groups=groups, create_bullet=create_bullet)
-        self.health = 10
+        self.input_source = input_source or KeyboardInput()
+        self.health = st.PLAYER_MAX_HEALTH
+        self.max_health = st.PLAYER_MAX_HEALTH
         self.coll_obj = coll_sprites
-        self.gravity = 15
+        self.gravity = 1800
         self.jump_speed = 1200
         self.on_ground = False
         self.moving_floor = None
@@ -34,7 +41,7 @@ class Player(Entity):
         rect_below_player = pg.Rect(0, 0, self.rect.width, 5)
         rect_below_player.midtop = self.rect.midbottom
 
-        for sprite in self.coll_obj.sprites():
+        for sprite in self.coll_obj.near(rect_below_player):
             if sprite.rect.colliderect(rect_below_player):
                 if self.direction.y > 0:
                     self.on_ground = True
@@ -42,7 +49,7 @@ class Player(Entity):
                     self.moving_floor = sprite
 
     def input(self):
-        keys = pg.key.get_pressed()
+        keys = self.input_source.get_pressed()
 
         if keys[pg.K_LEFT]:
             self.direction.x = -1
@@ -65,11 +72,11 @@ class Player(Entity):
 
             self.fire_bullet(blt_pos + y_offset, blt_dir, self)
             self.can_shoot = False
-            self.blt_time = pg.time.get_ticks()
-            self.fire_sound.play()
+            self.blt_time = clock.get_ticks()
+            sounds.play('fire', self.rect)
 
     def collision(self, dir):
-        for sprite in self.coll_obj.sprites():
+        for sprite in self.coll_obj.near(self.rect):
             if sprite.rect.colliderect(self.rect):
                 if dir == "horizontal":
                     if self.rect.left <= sprite.rect.right and self.prev_rect.left >= sprite.prev_rect.right:
@@ -97,7 +104,7 @@ class Player(Entity):
         self.rect.x = round(self.pos.x)
         self.collision("horizontal")
 
-        self.direction.y += self.gravity
+        self.direction.y += self.gravity * deltaTime
         self.pos.y += self.direction.y * deltaTime
 
         if self.moving_floor and self.moving_floor.direction.y > 0 and self.direction.y > 0:
@@ -0,0 +1,98 @@
+import json
+from time import perf_counter
+from collections import deque, defaultdict
+import pygame as pg
+import settings as st
+
+class FrameProfiler:
+    def __init__(self, history=st.PROFILER_HISTORY):
+        # Every hook checks this flag first, so a disabled profiler costs one attribute test per phase
+        self.enabled = False
+        self.show_overlay = False
+        self.frames = deque(maxlen=history)
+        self.sections = []
+        self.frame_start = self.last = 0.0
+        self.font = None
+
+    def toggle(self):
+        self.enabled = self.show_overlay = not self.enabled
+        self.frames.clear()
+        self.sections = []
+        self.frame_start = self.last = perf_counter()
+
+    def start_frame(self):
+        if self.enabled:
+            self.frame_start = self.last = perf_counter()
+            self.sections = []
+
+    def mark(self, name):
+        # Records the time since the previous mark under `name`
+        if self.enabled:
+            now = perf_counter()
+            self.sections.append((name, self.last, now))
+            self.last = now
+
+    def end_frame(self):
+        if self.enabled:
+            self.frames.append((self.frame_start, self.last, self.sections))
+
+    def update_by_class(self, group, deltaTime):
+        # Same as group.update(deltaTime), with the time split by sprite class
+        totals = defaultdict(float)
+        for sprite in group.sprites():
+            start = perf_counter()
+            sprite.update(deltaTime)
+            totals[type(sprite).__name__] += perf_counter() - start
+
+        start = self.last
+        for (name, total) in totals.items():
+            self.sections.append((f"update:{name}", start, start + total))
+            start += total
+        self.last = perf_counter()
+
+    def phase_averages(self, frame_count=60):
+        recent = list(self.frames)[-frame_count:]
+        totals = defaultdict(float)
+        for (frame_start, frame_end, sections) in recent:
+            for (name, start, end) in sections:
+                totals[name] += end - start
+        return {name: total / max(1, len(recent)) * 1000 for (name, total) in totals.items()}
+
+    def draw_overlay(self, surface):
+        if not self.show_overlay:
+            return
+        if self.font is None:
+            self.font = pg.font.Font(None, 20)
+
+        averages = self.phase_averages()
+        graph_height = 60
+        panel = pg.Rect(10, st.WINDOW_HEIGHT - 30 - graph_height - 16 * len(averages), 320, 20 + graph_height + 16 * len(averages))
+        panel_surf = pg.Surface(panel.size)
+        panel_surf.set_alpha(180)
+        surface.blit(panel_surf, panel)
+
+        y = panel.top + 5
+        for (name, ms) in sorted(averages.items(), key=lambda item: -item[1]):
+            surface.blit(self.font.render(f"{name}: {ms:.2f} ms", True, (255, 255, 255)), (panel.left + 5, y))
+            y += 16
+
+        # Frame-time graph, scaled so two 60 fps frames fill the height
+        budget = 2 / 60
+        for (i, (frame_start, frame_end, sections)) in enumerate(list(self.frames)[-(panel.width - 10):]):
+            height = min(graph_height, int((frame_end - frame_start) / budget * graph_height))
+            color = (0, 255, 0) if frame_end - frame_start < 1 / 60 else (255, 80, 80)
+            x = panel.left + 5 + i
+            pg.draw.line(surface, color, (x, panel.bottom - 5), (x, panel.bottom - 5 - height))
+
+    def dump_trace(self, path='profile_trace.json'):
+        # Chrome trace-event format, viewable in chrome://tracing or Perfetto
+        events = []
+        for (frame_start, frame_end, sections) in self.frames:
+            events.append({'name': 'frame', 'ph': 'X', 'ts': frame_start * 1e6,
+                           'dur': (frame_end - frame_start) * 1e6, 'pid': 1, 'tid': 1})
+            for (name, start, end) in sections:
+                events.append({'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': (end - start) * 1e6, 'pid': 1, 'tid': 1})
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Profile trace written to {path}")
\ No newline at end of file
@@ -0,0 +1,45 @@
+import numpy as np
+
+# (difficulty_level 0-10, accuracy_level 0-5, health_level 0-5, kill_level 0-5, action)
+# Actions are [increase, decrease, maintain]
+STATE_SHAPE = (11, 6, 6, 6)
+ACTION_COUNT = 3
+
+class QTable:
+    def __init__(self, values=None, learning_rate=0.1, discount=0.9):
+        # Dense table over the whole (small, discrete) state space; plain numpy, no pygame
+        self.values = np.zeros(STATE_SHAPE + (ACTION_COUNT,)) if values is None else values
+        self.learning_rate = learning_rate
+        self.discount = discount
+
+    @staticmethod
+    def index(states):
+        # Works for a single state tuple or an (n, 4) array of states; out-of-range levels are clamped
+        states = np.asarray(states, dtype=np.int64)
+        return tuple(np.clip(states[..., i], 0, size - 1) for (i, size) in enumerate(STATE_SHAPE))
+
+    @classmethod
+    def from_dict(cls, table):
+        # Migrates the old {state tuple: [q, q, q]} pickles
+        q_table = cls()
+        for (state, q_values) in table.items():
+            q_table.values[q_table.index(state)] = q_values
+        return q_table
+
+    def get(self, state, action):
+        return float(self.values[self.index(state) + (action,)])
+
+    def best_action(self, state):
+        # Ties go to the lowest action, like list.index(max(...))
+        return int(np.argmax(self.values[self.index(state)]))
+
+    def update(self, state, action, reward, next_state):
+        self.update_batch([state], [action], [reward], [next_state])
+
+    def update_batch(self, states, actions, rewards, next_states):
+        # One vectorized TD step for every transition; repeated (state, action) pairs add up their updates
+        index = self.index(states) + (np.asarray(actions, dtype=np.int64),)
+        current = self.values[index]
+        next_max = self.values[self.index(next_states)].max(axis=-1)
+        td = self.learning_rate * (np.asarray(rewards, dtype=float) + self.discount * next_max - current)
+        np.add.at(self.values, index, td)
\ No newline at end of file
@@ -1,4 +1,18 @@
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720
+BG_COLOR = (249, 131, 103)
+TILE_SIZE = 64
+
+# The simulation runs at a fixed tick rate, independent of the render frame rate
+TICK_RATE = 120
+RENDER_FPS = 120
+MAX_CATCH_UP_STEPS = 5
+
+# Static map layers are baked into square chunks of this size at load time
+CHUNK_SIZE = 1024
+
+# Rendering only considers sprites in index cells near the viewport
+RENDER_CELL_SIZE = 256
+RENDER_MARGIN = 128
 
 LAYERS = {
     'BG': 0,
@@ -14,4 +28,42 @@ CHALLENGE_PARAMS = {
     'accuracy_required': 85,  # 85% accuracy
     'damage_increase': 5,  # Damage increases to 5 HP
     'speed_increase': 700  # Bullet speed increases to 700
-}
\ No newline at end of file
+}
+
+# Rows preallocated by the bullet system, the arrays double when they fill up
+BULLET_CAPACITY = 256
+
+# Sky strips are pre-tiled into one wide surface so each parallax layer is a single blit
+SKY_CACHE = True
+
+# Only push changed regions of the window while the camera stands still (--dirty-rects)
+DIRTY_RECTS = False
+
+# Rendered text surfaces kept by the text cache before the least recently used ones are dropped
+TEXT_CACHE_SIZE = 128
+
+# Player health, and the stats the DifficultyManager scales up from at difficulty level 1
+PLAYER_MAX_HEALTH = 10
+ENEMY_BASE_HEALTH = 2
+ENEMY_BASE_FIRE_RATE = 1500  # ms between shots
+ENEMY_BASE_BULLET_DAMAGE = 1
+ENEMY_BASE_BULLET_SPEED = 300
+PLAYER_BASE_BULLET_DAMAGE = 2
+
+# Seconds the difficulty model writer waits for further save requests before writing
+MODEL_SAVE_DELAY = 2.0
+# Where the difficulty model is saved; models from before the binary format are still read from the legacy pickle
+MODEL_PATH = 'difficulty_model.qtb'
+LEGACY_MODEL_PATH = 'difficulty_model.pkl'
+
+# Gameplay event log: ring buffer size and how often (seconds) it is appended to the file
+TELEMETRY_PATH = 'telemetry.bin'
+TELEMETRY_CAPACITY = 4096
+TELEMETRY_FLUSH_INTERVAL = 1.0
+
+# Mixer channels reserved per sound group, and how far off camera (px) a sound can still be heard
+SOUND_CHANNELS = {'music': 1, 'weapons': 8, 'hits': 6}
+SOUND_MARGIN = 200
+
+# Frames of timing history kept by the profiler (F3 toggles the overlay, F4 dumps a trace)
+PROFILER_HISTORY = 600
\ No newline at end of file
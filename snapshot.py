@@ -0,0 +1,28 @@
+import pygame as pg
+
+def copy_value(value):
+    if isinstance(value, (pg.Rect, pg.math.Vector2)):
+        return value.copy()
+    return value
+
+class WorldSnapshot:
+    def __init__(self, sprites):
+        # Each sprite's class lists the attributes that make up its restorable state
+        self.entries = []
+        for sprite in sprites:
+            state = {attr: copy_value(getattr(sprite, attr)) for attr in getattr(sprite, 'state_attrs', ())}
+            self.entries.append((sprite, sprite.groups(), state))
+        self.sprites = {sprite for (sprite, groups, state) in self.entries}
+
+    def restore(self, all_sprites):
+        # Anything spawned after the snapshot (bullets, muzzle flashes) goes away
+        for sprite in all_sprites.sprites():
+            if sprite not in self.sprites:
+                sprite.kill()
+
+        for (sprite, groups, state) in self.entries:
+            for (attr, value) in state.items():
+                setattr(sprite, attr, copy_value(value))
+            if not sprite.alive() and hasattr(sprite, 'revive'):
+                sprite.revive()
+            sprite.add(groups)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import pygame as pg
+import settings as st
+from assets import registry
+
+class SoundManager:
+    def __init__(self):
+        self.sounds = {}
+        self.groups = {}
+        self.voices = {}
+        self.started = {}
+        self.view_rect = None
+        self.play_count = 0
+        self.enabled = False
+        self.suppressed = 0
+        self.stolen = 0
+
+    def setup(self, channel_groups=st.SOUND_CHANNELS):
+        # Every channel belongs to one group, so a burst of gunfire can never take the music's channel
+        self.enabled = pg.mixer.get_init() is not None
+        if not self.enabled:
+            return
+        total = sum(channel_groups.values())
+        pg.mixer.set_num_channels(total)
+        pg.mixer.set_reserved(total)
+        first = 0
+        for (group, count) in channel_groups.items():
+            self.groups[group] = [pg.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+
+    def register(self, name, path, group, volume=1.0, max_voices=1):
+        # Decoded once through the asset registry and shared by every entity that plays it
+        if self.enabled:
+            self.sounds[name] = (registry.sound(path, volume), group, max_voices)
+            self.voices[name] = []
+
+    def set_view(self, rect):
+        self.view_rect = rect.inflate(2 * st.SOUND_MARGIN, 2 * st.SOUND_MARGIN)
+
+    def play(self, name, source_rect=None, loops=0):
+        if not self.enabled:
+            return None
+        # Things happening off camera are not heard
+        if source_rect is not None and self.view_rect is not None and not self.view_rect.colliderect(source_rect):
+            self.suppressed += 1
+            return None
+
+        sound, group, max_voices = self.sounds[name]
+        voices = [(order, channel) for (order, channel) in self.voices[name] if channel.get_sound() is sound and channel.get_busy()]
+        if len(voices) >= max_voices:
+            # At the voice cap the oldest voice of this sound is cut off and its channel reused
+            channel = voices.pop(0)[1]
+            self.stolen += 1
+        else:
+            channel = self.free_channel(group)
+            voices = [(order, ch) for (order, ch) in voices if ch is not channel]
+
+        self.play_count += 1
+        self.started[channel] = self.play_count
+        channel.play(sound, loops)
+        voices.append((self.play_count, channel))
+        self.voices[name] = voices
+        return channel
+
+    def free_channel(self, group):
+        channels = self.groups[group]
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        # Group is full: steal the channel whose sound started longest ago
+        self.stolen += 1
+        return min(channels, key=lambda channel: self.started.get(channel, 0))
+
+    def stats(self):
+        return {'plays': self.play_count, 'suppressed': self.suppressed, 'stolen': self.stolen}
+
+sounds = SoundManager()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import numpy as np
+import pygame as pg
+import settings as st
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right = max(left, (rect.right - 1) // size)
+        bottom = max(top, (rect.bottom - 1) // size)
+        return (left, top, right, bottom)
+
+    def insert(self, item, rect):
+        bounds = self.cell_range(rect)
+        self.item_cells[item] = bounds
+        left, top, right, bottom = bounds
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self.cells.setdefault((cx, cy), set()).add(item)
+
+    def remove(self, item):
+        left, top, right, bottom = self.item_cells.pop(item)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell = self.cells[(cx, cy)]
+                cell.discard(item)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def move(self, item, rect):
+        # Only touch the cells when the item has actually crossed a cell boundary
+        if self.cell_range(rect) != self.item_cells[item]:
+            self.remove(item)
+            self.insert(item, rect)
+
+    def query(self, rect):
+        found = set()
+        left, top, right, bottom = self.cell_range(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found |= cell
+        return found
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def __len__(self):
+        return len(self.item_cells)
+
+class TerrainGrid:
+    def __init__(self, width, height, cell_size=st.TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cells = np.zeros((height, width), dtype=bool)
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        left = max(0, rect.left // size)
+        top = max(0, rect.top // size)
+        right = min(self.width - 1, (rect.right - 1) // size)
+        bottom = min(self.height - 1, (rect.bottom - 1) // size)
+        return (left, top, right, bottom)
+
+    def fill(self, rect):
+        left, top, right, bottom = self.cell_range(rect)
+        self.cells[top:bottom + 1, left:right + 1] = True
+
+    def hits(self, rect):
+        left, top, right, bottom = self.cell_range(rect)
+        return bool(self.cells[top:bottom + 1, left:right + 1].any())
+
+    def hits_many(self, left, top, right, bottom):
+        # Tests a batch of rects no larger than a cell by their corners; anything off the map is a miss
+        size = self.cell_size
+        hit = np.zeros(len(left), dtype=bool)
+        for xs in (left, right - 1):
+            for ys in (top, bottom - 1):
+                cx = xs // size
+                cy = ys // size
+                inside = (cx >= 0) & (cx < self.width) & (cy >= 0) & (cy < self.height)
+                hit[inside] |= self.cells[cy[inside], cx[inside]]
+        return hit
+
+class CollisionGroup(pg.sprite.Group):
+    def __init__(self, *sprites):
+        # Static tiles and moving platforms live in separate hashes keyed by tile cell
+        self.static_hash = SpatialHash(st.TILE_SIZE)
+        self.moving_hash = SpatialHash(st.TILE_SIZE)
+        self.sprite_order = {}
+        self.pending = {}
+        self.added_count = 0
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        # Tiles set their rect after joining their groups, so hashing waits for the next query
+        self.pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if sprite in self.pending:
+            del self.pending[sprite]
+        else:
+            self.hash_for(sprite).remove(sprite)
+            del self.sprite_order[sprite]
+
+    def hash_for(self, sprite):
+        return self.moving_hash if getattr(sprite, 'moving', False) else self.static_hash
+
+    def flush_pending(self):
+        for sprite in self.pending:
+            self.hash_for(sprite).insert(sprite, sprite.rect)
+            self.sprite_order[sprite] = self.added_count
+            self.added_count += 1
+        self.pending.clear()
+
+    def refresh(self):
+        # Called once per step, after moving platforms have been repositioned
+        self.flush_pending()
+        for sprite in list(self.moving_hash.item_cells):
+            self.moving_hash.move(sprite, sprite.rect)
+
+    def near_moving(self, rect):
+        # Platforms may have moved a little since the last refresh, so look one cell further out
+        cell_size = self.moving_hash.cell_size
+        return self.moving_hash.query(rect.inflate(2 * cell_size, 2 * cell_size))
+
+    def near(self, rect):
+        if self.pending:
+            self.flush_pending()
+        candidates = self.static_hash.query(rect)
+        if self.moving_hash.item_cells:
+            candidates |= self.near_moving(rect)
+        return sorted(candidates, key=self.sprite_order.__getitem__)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+import atexit
+import struct
+import threading
+import numpy as np
+import settings as st
+from game_clock import clock
+
+EVENT_KINDS = ('shot_fired', 'shot_hit', 'enemy_killed', 'damage_taken', 'difficulty_change')
+KIND_CODES = {kind: code for (code, kind) in enumerate(EVENT_KINDS)}
+
+# One fixed-size record per event; game time is in ms from the game clock
+EVENT_DTYPE = np.dtype([('time', '<u8'), ('kind', 'u1'), ('level', 'u1'), ('value', '<f4')])
+
+# File header: magic, format version, record size; records are appended raw after it
+MAGIC = b'CTEL'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+
+class Telemetry:
+    def __init__(self, path=st.TELEMETRY_PATH, capacity=st.TELEMETRY_CAPACITY, flush_interval=st.TELEMETRY_FLUSH_INTERVAL):
+        # Events go into a preallocated ring buffer; a background thread appends them to the log in batches
+        self.path = path
+        self.buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.capacity = capacity
+        self.written = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.file_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name='telemetry', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def record(self, kind, value=0, level=0):
+        with self.lock:
+            # A full buffer overwrites its oldest unflushed event rather than blocking the game
+            if self.written - self.flushed == self.capacity:
+                self.flushed += 1
+                self.dropped += 1
+            self.buffer[self.written % self.capacity] = (clock.get_ticks(), KIND_CODES[kind], level, value)
+            self.written += 1
+            if self.written - self.flushed >= self.capacity // 2:
+                self.wake.set()
+
+    def take_pending(self):
+        with self.lock:
+            start, end = self.flushed, self.written
+            self.flushed = end
+            if start == end:
+                return None
+            first, last = start % self.capacity, end % self.capacity
+            if first < last:
+                return self.buffer[first:last].copy()
+            return np.concatenate((self.buffer[first:], self.buffer[:last]))
+
+    def flush(self):
+        with self.file_lock:
+            events = self.take_pending()
+            if events is None:
+                return
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, 'ab') as f:
+                if new_file:
+                    f.write(HEADER.pack(MAGIC, VERSION, EVENT_DTYPE.itemsize))
+                f.write(events.tobytes())
+
+    def run(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Failed to write telemetry: {e}")
+
+    def close(self):
+        self.closed = True
+        self.wake.set()
+        self.flush()
+
+def read_events(path, chunk_size=65536):
+    # Streams the log back as arrays of at most chunk_size events; a torn last record is ignored
+    with open(path, 'rb') as f:
+        magic, version, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or record_size != EVENT_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a version {VERSION} telemetry log")
+        while True:
+            chunk = f.read(chunk_size * record_size)
+            count = len(chunk) // record_size
+            if count == 0:
+                return
+            yield np.frombuffer(chunk, dtype=EVENT_DTYPE, count=count)
+
+def load_events(path):
+    chunks = list(read_events(path))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=EVENT_DTYPE)
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pygame as pg
+import settings as st
+from collections import OrderedDict
+
+class TextCache:
+    def __init__(self, max_size=st.TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.panels = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        # Text is only rendered again when the string (or its font/color) changes, old entries are evicted LRU
+        key = (font, text, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def panel(self, size, color, alpha=None):
+        # Plain translucent backgrounds are few and never change, so they are kept forever
+        key = (tuple(size), tuple(color), alpha)
+        if key not in self.panels:
+            surf = pg.Surface(size)
+            if alpha is not None:
+                surf.set_alpha(alpha)
+            surf.fill(color)
+            self.panels[key] = surf
+        return self.panels[key]
+
+    def clear(self):
+        self.surfaces.clear()
+        self.panels.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.surfaces)}
+
+text_cache = TextCache()
\ No newline at end of file
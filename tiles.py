@@ -2,6 +2,8 @@ import pygame as pg
 import settings as st
 
 class Tile(pg.sprite.Sprite):
+    moving = False
+
     def __init__(self, position, surface, groups, layer_name):
         super().__init__(groups)
         self.image = surface
@@ -14,6 +16,9 @@ class TileForCollision(Tile):
         self.prev_rect = self.rect.copy()
 
 class MovingPlatform(TileForCollision):
+    moving = True
+    state_attrs = ('rect', 'prev_rect', 'pos', 'direction')
+
     def __init__(self, position, surface, groups):
         super().__init__(position, surface, groups)
         self.direction = pg.math.Vector2(0, -1)
@@ -23,4 +28,31 @@ class MovingPlatform(TileForCollision):
     def update(self, deltaTime):
         self.prev_rect = self.rect.copy()
         self.pos.y += self.direction.y * self.speed * deltaTime
-        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
\ No newline at end of file
+        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+
+class StaticLayer:
+    def __init__(self, tiles, layer_name, chunk_size=st.CHUNK_SIZE):
+        self.z = st.LAYERS[layer_name]
+        self.chunk_size = chunk_size
+        self.chunks = {}
+
+        # Compose every tile into the chunk surfaces it overlaps
+        for (position, surface) in tiles:
+            tile_rect = surface.get_rect(topleft=position)
+            for cx in range(tile_rect.left // chunk_size, (tile_rect.right - 1) // chunk_size + 1):
+                for cy in range(tile_rect.top // chunk_size, (tile_rect.bottom - 1) // chunk_size + 1):
+                    chunk = self.chunks.get((cx, cy))
+                    if chunk is None:
+                        chunk = pg.Surface((chunk_size, chunk_size), pg.SRCALPHA)
+                        self.chunks[(cx, cy)] = chunk
+                    chunk.blit(surface, (tile_rect.x - cx * chunk_size, tile_rect.y - cy * chunk_size))
+
+    def draw(self, surface, offset):
+        offset_x, offset_y = int(offset.x), int(offset.y)
+        size = self.chunk_size
+        width, height = surface.get_size()
+        for cx in range(offset_x // size, (offset_x + width) // size + 1):
+            for cy in range(offset_y // size, (offset_y + height) // size + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None:
+                    surface.blit(chunk, (cx * size - offset_x, cy * size - offset_y))
\ No newline at end of file
@@ -0,0 +1,198 @@
+# Trains the DifficultyManager policy offline on synthetic play sessions and writes difficulty_model.qtb.
+# Run from the project root with: python train_difficulty.py --sessions 2000 --workers 8
+import os
+import time
+import argparse
+import multiprocessing
+from collections import deque
+import numpy as np
+import settings as st
+from q_table import QTable
+from model_store import write_model
+from difficulty_manager import (load_q_table, discretize_state, performance_score, reward_for, rule_override,
+                                CHANGE_ACTIONS, CHALLENGE_DURATION, CHALLENGE_ACCURACY, changed_level,
+                                enemy_parameters, challenge_ready, evaluation_due)
+
+class SyntheticPlayer:
+    def __init__(self, accuracy, reaction_time, aggression):
+        # accuracy: chance a shot lands at level 1, reaction_time: seconds to react to a bullet,
+        # aggression: 0-1, how much of the time the player is firing and in enemy range
+        self.accuracy = accuracy
+        self.reaction_time = reaction_time
+        self.aggression = aggression
+
+    @classmethod
+    def sample(cls, rng):
+        return cls(rng.uniform(0.2, 0.95), rng.uniform(0.15, 0.8), rng.uniform(0.2, 1.0))
+
+    def play(self, difficulty_level, seconds, rng):
+        # Statistical stand-in for `seconds` of play, returns (shots_fired, shots_hit, kills, hits_taken)
+        enemy_health, time_bw_shots, bullet_speed = enemy_parameters(difficulty_level)
+
+        # The player can shoot at most every 300ms
+        shots_fired = rng.poisson(seconds / 0.3 * self.aggression)
+        hit_chance = np.clip(self.accuracy * (1 - 0.03 * (difficulty_level - 1)), 0, 1)
+        shots_hit = rng.binomial(shots_fired, hit_chance)
+        kills = shots_hit // enemy_health
+
+        # Bullets coming in while in range; a bullet is dodged if it takes longer to arrive than the player needs to react
+        incoming = rng.poisson(seconds * self.aggression / (time_bw_shots / 1000))
+        dodge_chance = np.clip(1 - self.reaction_time * bullet_speed / 600, 0.05, 0.95)
+        hits_taken = rng.binomial(incoming, 1 - dodge_chance)
+        return (shots_fired, shots_hit, kills, hits_taken)
+
+class TrainingSession:
+    # DifficultyManager's decision flow without pygame. Once an evaluation is due a suggestion is made every
+    # step (every frame in the game); the table only learns, and the metrics only reset, when a change is applied
+    def __init__(self, q_table, counts, player, rng, epsilon=0.2):
+        self.q_table = q_table
+        self.counts = counts
+        self.player = player
+        self.rng = rng
+        self.epsilon = epsilon
+        self.metrics = {'damage_taken': 0, 'enemies_killed': 0, 'shots_fired': 0, 'shots_hit': 0,
+                        'time_alive': 0, 'last_evaluation_time': 0, 'challenge_time': 0}
+        self.replay_buffer = deque(maxlen=1000)
+        self.difficulty_level = 1
+        self.enemy_bullet_damage = st.ENEMY_BASE_BULLET_DAMAGE
+        self.health = st.PLAYER_MAX_HEALTH
+        # None until a challenge starts, then 'active', 'completed' or 'failed'; like the manager, only one per session
+        self.challenge = None
+        # 'difficulty' or 'challenge' while a prompt waits for the player
+        self.prompt = None
+
+    def health_percentage(self):
+        return self.health / st.PLAYER_MAX_HEALTH
+
+    def state(self):
+        return discretize_state(self.difficulty_level, self.metrics, self.health_percentage())
+
+    def step(self, seconds):
+        # A prompt is answered on the step after it appears, yes with a chance given by the player's aggression.
+        # Saying no to (or ignoring) a difficulty prompt applies "maintain"; declining a challenge reward changes nothing
+        if self.prompt is not None:
+            accepted = self.rng.random() < self.player.aggression
+            if self.prompt == "difficulty":
+                self.apply_change("increase" if accepted else "maintain")
+            elif accepted:
+                self.apply_change("challenge_success")
+            self.prompt = None
+
+        shots_fired, shots_hit, kills, hits_taken = self.player.play(self.difficulty_level, seconds, self.rng)
+        metrics = self.metrics
+        metrics['time_alive'] += seconds
+        metrics['shots_fired'] += shots_fired
+        metrics['shots_hit'] += shots_hit
+        metrics['enemies_killed'] += kills
+        metrics['damage_taken'] += hits_taken
+        self.health -= hits_taken * self.enemy_bullet_damage
+        if self.health <= 0:
+            self.health = st.PLAYER_MAX_HEALTH
+
+        if self.challenge == 'active':
+            metrics['challenge_time'] += seconds
+            if metrics['challenge_time'] >= CHALLENGE_DURATION:
+                self.challenge = 'failed'
+            elif shots_hit and metrics['shots_hit'] / max(1, metrics['shots_fired']) >= CHALLENGE_ACCURACY:
+                self.challenge = 'completed'
+                self.prompt = "challenge"
+
+        if evaluation_due(metrics):
+            self.suggest()
+
+    def suggest(self):
+        if self.challenge is None and challenge_ready(self.difficulty_level, self.metrics):
+            self.challenge = 'active'
+            self.metrics['challenge_time'] = 0
+            return
+
+        state = self.state()
+        if self.rng.random() < self.epsilon:
+            action = int(self.rng.integers(3))
+        else:
+            action = self.q_table.best_action(state)
+        action = rule_override(action, self.difficulty_level, performance_score(self.metrics, self.health_percentage()))
+
+        if action == 0 and self.difficulty_level < 10:
+            self.prompt = "difficulty"
+        elif action == 1 and self.difficulty_level > 1:
+            self.apply_change("decrease")
+
+    def apply_change(self, change):
+        old_state = self.state()
+        self.difficulty_level, extra_damage = changed_level(self.difficulty_level, change)
+        self.enemy_bullet_damage += extra_damage
+
+        reward = reward_for(self.metrics, self.health_percentage())
+        new_state = self.state()
+        action = CHANGE_ACTIONS[change]
+        self.q_table.update(old_state, action, reward, new_state)
+        np.add.at(self.counts, QTable.index(old_state) + (action,), 1)
+
+        self.replay_buffer.append((old_state, action, reward, new_state))
+        if len(self.replay_buffer) > 32:
+            batch = [self.replay_buffer[i] for i in self.rng.choice(len(self.replay_buffer), 32, replace=False)]
+            self.q_table.update_batch(*zip(*batch))
+
+        self.metrics['last_evaluation_time'] = self.metrics['time_alive']
+        for key in ('damage_taken', 'enemies_killed', 'shots_fired', 'shots_hit'):
+            self.metrics[key] = 0
+
+def run_session(q_table, counts, player, minutes, rng, step=2):
+    session = TrainingSession(q_table, counts, player, rng)
+    while session.metrics['time_alive'] < minutes * 60:
+        session.step(step)
+    return session.metrics['time_alive']
+
+def train_worker(job):
+    # Runs in a pool process: its own table, trained over its share of the sessions
+    (seed, sessions, minutes, values) = job
+    rng = np.random.default_rng(seed)
+    q_table = QTable(values.copy())
+    counts = np.zeros(q_table.values.shape)
+    simulated = 0
+    for _ in range(sessions):
+        simulated += run_session(q_table, counts, SyntheticPlayer.sample(rng), minutes, rng)
+    return (q_table.values, counts, simulated)
+
+def merge_tables(results, base_values):
+    # Visit-weighted average per (state, action); entries no worker visited keep the starting values
+    weighted = np.zeros(base_values.shape)
+    total = np.zeros(base_values.shape)
+    for (values, counts, simulated) in results:
+        weighted += values * counts
+        total += counts
+    return np.where(total > 0, weighted / np.maximum(total, 1), base_values)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline trainer for the difficulty policy")
+    parser.add_argument('--sessions', type=int, default=1000, help="synthetic play sessions in total")
+    parser.add_argument('--minutes', type=float, default=20, help="simulated length of each session")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--resume', action='store_true', help="start from the existing model at --out")
+    parser.add_argument('--out', default=st.MODEL_PATH)
+    args = parser.parse_args()
+
+    base = QTable()
+    if args.resume and os.path.exists(args.out):
+        base = load_q_table(args.out)
+
+    workers = max(1, min(args.workers, args.sessions))
+    shares = [args.sessions // workers + (1 if i < args.sessions % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(args.seed).spawn(workers)
+    jobs = [(seed, share, args.minutes, base.values) for (seed, share) in zip(seeds, shares)]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.map(train_worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    write_model(args.out, merge_tables(results, base.values))
+    simulated_hours = sum(result[2] for result in results) / 3600
+    print(f"Trained on {args.sessions} sessions ({simulated_hours:.1f} simulated hours) in {elapsed:.1f}s "
+          f"with {workers} workers: {simulated_hours / (elapsed / 60):.0f} simulated hours per minute")
+    print(f"Model written to {args.out}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file